@@ -24,6 +24,12 @@ class APIHandler:
             page += 1
         return all_data
 
+    def get_item(self, api_url, params=None):
+        url = self.base_url + api_url
+        response = requests.get(url, params=params)
+        response.raise_for_status()  # Raise an exception for any HTTP error status codes
+        return response.json()
+
     def post(self, api_url, data):
         url = self.base_url + api_url
         # Convert the dictionary to JSON format
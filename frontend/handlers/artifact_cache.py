@@ -0,0 +1,90 @@
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger("optiver." + __name__)
+
+
+class ArtifactCache:
+    """
+    A content-addressed on-disk cache of S3 objects, keyed by bucket, key and
+    ETag, with size-bounded LRU eviction. Files are renamed into place once
+    complete, so readers never see a partial file. Eviction is only serialized
+    between the threads of one process, which is all the Streamlit app runs.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, bucket_name, s3_path, etag):
+        digest = hashlib.sha256(f"{bucket_name}/{s3_path}@{etag}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}{Path(s3_path).suffix}"
+
+    def fetch(self, s3_handler, s3_path):
+        etag = s3_handler.get_etag(s3_path)
+        path = self.path(s3_handler.bucket_name, s3_path, etag)
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+            return path, etag
+        except FileNotFoundError:
+            pass
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # Only the version the ETag names may be stored under it
+                s3_handler.download_version(s3_path, etag, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.info(f"{s3_path} downloaded into the artifact cache.")
+        self.evict(keep=path)
+        return path, etag
+
+    def open(self, s3_handler, s3_path):
+        try:
+            path, etag = self.fetch(s3_handler, s3_path)
+            return open(path, "rb"), etag
+        except FileNotFoundError:
+            # Evicted by another reader between the fetch and the open
+            path, etag = self.fetch(s3_handler, s3_path)
+            return open(path, "rb"), etag
+
+    def evict(self, keep=None):
+        with self._lock:
+            files = []
+            for path in self.cache_dir.iterdir():
+                if path.suffix == ".tmp" or path == keep:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total_bytes = sum(size for _, size, _ in files)
+            if keep is not None and keep.exists():
+                total_bytes += keep.stat().st_size
+            for _, size, path in sorted(files):
+                if total_bytes <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total_bytes -= size
+                logger.info(f"Evicted {path.name} from the artifact cache.")
+
+
+@lru_cache(maxsize=None)
+def get_artifact_cache():
+    return ArtifactCache(
+        cache_dir=os.getenv("ARTIFACT_CACHE_DIR", "artifacts/cache"),
+        max_bytes=int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", 1024**3)),
+    )
@@ -0,0 +1,29 @@
+import pandas as pd
+import pyarrow.parquet as pq
+from handlers.artifact_cache import get_artifact_cache
+from handlers.s3_handler import get_s3_handler
+
+
+def read_stock_predictions(s3_path, stock_id, columns=None):
+    """
+    Read one stock's rows of an inference results file.
+
+    The file comes from the local artifact cache. For Parquet files only the
+    requested columns and the row groups whose stock_id statistics can hold the
+    stock are decoded; CSV files written before the Parquet format are read in
+    full and filtered.
+
+    :param s3_path: S3 path of the inference results, .parquet or .csv.
+    :param stock_id: The stock to read.
+    :param columns: Columns to read, all if None.
+    :return: DataFrame with the stock's rows.
+    """
+    f, _ = get_artifact_cache().open(get_s3_handler(), s3_path)
+    with f:
+        if s3_path.endswith(".csv"):
+            df = pd.read_csv(f, usecols=columns)
+            return df[df["stock_id"] == int(stock_id)].reset_index(drop=True)
+        table = pq.read_table(
+            f, columns=columns, filters=[("stock_id", "=", int(stock_id))]
+        )
+    return table.to_pandas()
@@ -1,37 +1,71 @@
 import os
+import shutil
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger("optiver." + __name__)
 
+MiB = 1024**2
+
+# Read size when streaming an object body to a file
+DOWNLOAD_CHUNK_BYTES = MiB
+
+
+@lru_cache(maxsize=None)
+def get_transfer_config():
+    return TransferConfig(
+        multipart_threshold=int(os.getenv("S3_MULTIPART_THRESHOLD", 16 * MiB)),
+        multipart_chunksize=int(os.getenv("S3_MULTIPART_CHUNKSIZE", 16 * MiB)),
+        max_concurrency=int(os.getenv("S3_MAX_CONCURRENCY", 10)),
+        use_threads=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    # One client, and connection pool, for every rerun of the app
+    return boto3.client(
+        "s3",
+        aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
+        aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
+        region_name=os.environ["REGION"],
+        config=Config(
+            max_pool_connections=2 * get_transfer_config().max_concurrency
+        ),
+    )
+
 
 class S3Handler:
-    def __init__(self):
-        self.bucket_name = os.environ["S3_BUCKET_NAME"]
-        access_key_id = os.environ["AWS_ACCESS_KEY_ID"]
-        secret_access_key = os.environ["AWS_SECRET_ACCESS_KEY"]
-        region = os.environ["REGION"]
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=access_key_id,
-            aws_secret_access_key=secret_access_key,
-            region_name=region,
+    def __init__(self, s3_client=None, transfer_config=None, bucket_name=None):
+        self.bucket_name = bucket_name or os.environ["S3_BUCKET_NAME"]
+        self.s3_client = s3_client or get_s3_client()
+        self.transfer_config = transfer_config or get_transfer_config()
+
+    def download_version(self, s3_path, etag, fileobj):
+        # Fails with PreconditionFailed if the object no longer has this ETag
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name, Key=s3_path, IfMatch=etag
         )
+        shutil.copyfileobj(response["Body"], fileobj, DOWNLOAD_CHUNK_BYTES)
 
-    def download_file(self, s3_path, local_dir):
-        try:
-            file_name = os.path.basename(s3_path)
-            local_path = os.path.join(local_dir, file_name)
-            self.s3_client.download_file(self.bucket_name, s3_path, local_path)
-            return local_path
-        except ClientError as e:
-            logger.error(f"Error downloading file from S3: {e}")
-            return None
+    def get_etag(self, s3_path):
+        response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_path)
+        return response["ETag"].strip('"')
 
     def upload_file(self, local_path, s3_path):
         try:
-            self.s3_client.upload_file(local_path, self.bucket_name, s3_path)
+            self.s3_client.upload_file(
+                local_path, self.bucket_name, s3_path, Config=self.transfer_config
+            )
             logger.info(f"File uploaded to S3: {s3_path}")
         except ClientError as e:
             logger.error(f"Error uploading file to S3: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_s3_handler():
+    return S3Handler()
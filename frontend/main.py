@@ -5,7 +5,7 @@ warnings.filterwarnings("ignore")
 import requests
 import os
 from handlers.api_handler import APIHandler
-from handlers.s3_handler import S3Handler
+from handlers.inference_reader import read_stock_predictions
 import streamlit as st
 import plotly.express as px
 from pathlib import Path
@@ -71,27 +71,65 @@ if __name__ == "__main__":
     if "holiday_dates_2023" not in st.session_state:
         st.session_state["holiday_dates_2023"] = get_holidays("US", 2023)
 
-    if "inference_data" not in st.session_state:
-        st.session_state["inference_data"] = None
+    if "inference_request" not in st.session_state:
+        st.session_state["inference_request"] = None
 
     if "training_success" not in st.session_state:
         st.session_state["training_success"] = False
 
     def fetch_models():
-        # Fetch all models from the API
-        all_models = st.session_state["api_get_handler"].get("/models/", {})
-        print(all_models)
-
-        if all_models:
-            last_model = sorted(all_models, key=lambda x: x["date_id"], reverse=True)[0]
+        # Fetch the model with the latest date_id from the API
+        try:
+            last_model = st.session_state["api_get_handler"].get_item("/models/latest")
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code != 404:
+                raise
+            last_model = None
+
+        all_models = []
+        if last_model:
             st.session_state["last_date_id"] = last_model["date_id"]
             st.session_state["last_model_id"] = last_model["model_id"]
             st.session_state["last_model_name"] = last_model["model_name"]
+            all_models = [last_model]
         st.session_state["all_models"] = all_models
         st.session_state["last_fetch_time"] = datetime.now()
 
         st.rerun()  # Ensure the page re-runs to update display
 
+    def fetch_stock_predictions(inference_request, stock_id):
+        # Fetch a single stock's predictions in columnar format instead of the whole day
+        params = {**inference_request, "stock_id": stock_id, "format": "columnar"}
+        try:
+            predictions = st.session_state["api_get_handler"].get_item(
+                "/predictions/", params
+            )
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code == 404:
+                return fetch_stock_predictions_from_s3(inference_request, stock_id)
+            raise
+        return pd.DataFrame(predictions["data"])
+
+    def fetch_stock_predictions_from_s3(inference_request, stock_id):
+        # Fall back to the uploaded results; Parquet results are read by row group
+        try:
+            inferences = st.session_state["api_get_handler"].get_item(
+                "/model-inferences/", inference_request
+            )
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code == 404:
+                return pd.DataFrame()
+            raise
+        s3_path = inferences["data"][-1]["predictions"]
+        if not s3_path.endswith((".parquet", ".csv")):
+            st.warning(f"Unsupported inference results format: {s3_path}")
+            return pd.DataFrame()
+        return read_stock_predictions(
+            s3_path,
+            stock_id,
+            columns=["stock_id", "seconds_in_bucket", "target", "prediction"],
+        )
+
     # Automatically fetch models when the app loads
     if "all_models" not in st.session_state or st.session_state["all_models"] is None:
         fetch_models()
@@ -238,32 +276,12 @@ if __name__ == "__main__":
                 else:
                     st.error(f"An error occurred: {err}")
 
-            model_inference_endpoint = "/model-inferences/"
-            model_inference_data = {
+            # Predictions are queried per stock from the API once a stock ID is entered
+            st.session_state["inference_request"] = {
                 "model_id": st.session_state["last_model_id"],  # ID of the model
                 "date_id": prediction_date_id,  # ID of the date.
             }
 
-            # fetch the s3 path
-            model_inferences_data = st.session_state["api_get_handler"].get(
-                model_inference_endpoint, model_inference_data
-            )
-            s3_path = model_inferences_data[0]["predictions"]
-
-            inference_data_local_path = S3Handler().download_file(
-                s3_path, artifact_dir
-            )  # f'inference_{request.model_id}_{request.pred_date_id}.csv'
-            # inference_data_local_path = "artifacts/inference_24_405.csv"
-
-            # Load inference data outside of the try block to catch file-specific errors separately
-            try:
-                st.session_state["inference_data"] = pd.read_csv(
-                    inference_data_local_path
-                )
-            except Exception as e:
-                st.error(f"Failed to load data: {e}")
-                inference_data = None
-
         # Initialize or load existing session state variables
         if "stock_id_display" not in st.session_state:
             st.session_state["stock_id_display"] = ""
@@ -273,8 +291,8 @@ if __name__ == "__main__":
 
         tab1, tab2 = st.tabs(["Show Inference Data", "Plot Prediction Data"])
 
-        inference_data = st.session_state["inference_data"]
-        if inference_data is not None and "stock_id" in inference_data.columns:
+        inference_request = st.session_state["inference_request"]
+        if inference_request is not None:
             # Place the input field in the fixed container
             with input_container:
                 # Placeholders for text input within the container
@@ -292,9 +310,9 @@ if __name__ == "__main__":
                     stock_id_int = int(
                         st.session_state["stock_id_display"]
                     )  # Ensure the ID is integer
-                    inference_data_filtered = inference_data[
-                        inference_data["stock_id"] == stock_id_int
-                    ]
+                    inference_data_filtered = fetch_stock_predictions(
+                        inference_request, stock_id_int
+                    )
 
                     if not inference_data_filtered.empty:
                         with tab1:
@@ -15,7 +15,7 @@ def get_all_file_paths(folder_path):
 
 
 def extract_pred_dates_from_paths(paths):
-    pattern = r"inference_\d+_(\d+)\.csv"
+    pattern = r"inference_\d+_(\d+)\.(?:csv|parquet)"
     pred_dates = []
     for path in paths:
         match = re.search(pattern, path)
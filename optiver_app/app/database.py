@@ -16,18 +16,23 @@ logger = logging.getLogger("optiver." + __name__)
 load_dotenv()
 env = os.environ
 
-# Retrieve database secrets from AWS Secrets Manager
-logger.info("Retrieving database secrets.")
-secrets = get_secret()
-
-# Database connection details
-hostname = env.get("DB_HOST")
-dbname = env.get("DB_NAME")
-port = env.get("DB_PORT")
-
-# Construct the database URL
-DATABASE_URL = f"postgresql://{secrets['username']}:{secrets['password']}@{hostname}:{port}/{dbname}"
-logger.info(f"Database URL constructed: {DATABASE_URL}")
+if env.get("DATABASE_URL"):
+    # An explicit URL (e.g. a local database for benchmarks) skips Secrets Manager
+    DATABASE_URL = env["DATABASE_URL"]
+    logger.info("Using DATABASE_URL from environment.")
+else:
+    # Retrieve database secrets from AWS Secrets Manager
+    logger.info("Retrieving database secrets.")
+    secrets = get_secret()
+
+    # Database connection details
+    hostname = env.get("DB_HOST")
+    dbname = env.get("DB_NAME")
+    port = env.get("DB_PORT")
+
+    # Construct the database URL
+    DATABASE_URL = f"postgresql://{secrets['username']}:{secrets['password']}@{hostname}:{port}/{dbname}"
+    logger.info(f"Database URL constructed: {DATABASE_URL}")
 
 # Create SQLAlchemy engine
 engine = create_engine(DATABASE_URL)
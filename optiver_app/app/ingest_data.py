@@ -1,7 +1,7 @@
 import argparse
 import os
 import pandas as pd
-from database import SessionLocal
+from app.database import SessionLocal
 import logging
 import logging.config
 from app.schema import StockData, DateMapping
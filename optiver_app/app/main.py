@@ -1,5 +1,12 @@
 from fastapi import FastAPI
-from app.routers import date_mappings, stock_data, models, model_inferences
+from app.routers import (
+    date_mappings,
+    stock_data,
+    models,
+    model_inferences,
+    predictions,
+    training_sessions,
+)
 
 import logging
 import logging.config
@@ -17,6 +24,8 @@ app.include_router(date_mappings.router)
 app.include_router(stock_data.router)
 app.include_router(models.router)
 app.include_router(model_inferences.router)
+app.include_router(predictions.router)
+app.include_router(training_sessions.router)
 
 
 @app.get("/healthcheck/")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date as dtdate
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Dict, Literal
 
 # Pydantic models for data validation and API interaction
 
@@ -50,6 +50,46 @@ class StockDataRequest(BaseModel):
     train_type: str
 
 
+class StockDayBlockResponse(BaseModel):
+    """
+    Response model for the decoded block of one stock and date.
+
+    Attributes:
+        stock_id (int): Identifier for the stock.
+        date_id (int): Identifier for the date.
+        train_type (Optional[str]): Type of training.
+        num_rows (int): Number of snapshots in the block.
+        data (Dict[str, List[Any]]): Column name to column values, in bucket order.
+    """
+
+    stock_id: int
+    date_id: int
+    train_type: Optional[str] = None
+    num_rows: int
+    data: Dict[str, List[Any]]
+
+
+class StockSeriesResponse(BaseModel):
+    """
+    Response model for a downsampled series of one stock column.
+
+    Attributes:
+        stock_id (int): Identifier for the stock.
+        column (str): Name of the returned column.
+        total_points (int): Number of points before downsampling.
+        date_id (List[int]): Date ID of each returned point.
+        seconds_in_bucket (List[int]): Seconds in bucket of each returned point.
+        value (List[float]): Column value of each returned point.
+    """
+
+    stock_id: int
+    column: str
+    total_points: int
+    date_id: List[int]
+    seconds_in_bucket: List[int]
+    value: List[float]
+
+
 class DateMappingRequest(BaseModel):
     """
     Request model for Date Mapping.
@@ -145,6 +185,10 @@ class StockDataQueryParams(BaseModel):
     date_id: Optional[int] = Field(None, description="Date ID")
 
 
+# Serialization formats of model artifacts: native UBJSON, gzipped UBJSON, pickle
+ModelFormat = Literal["ubj", "ubj.gz", "pickle"]
+
+
 class ModelCreate(BaseModel):
     """
     Request model for creating a Model.
@@ -152,12 +196,16 @@ class ModelCreate(BaseModel):
     Attributes:
         model_name (str): Name of the model.
         model_artifact_path (str): Path to the model artifact.
+        model_format (str): Serialization format of the artifact.
         date_id (int): Identifier for the date.
+        parent_model_id (Optional[int]): The base model it was fine-tuned from.
     """
 
     model_name: str
     model_artifact_path: str
+    model_format: ModelFormat = "pickle"
     date_id: int
+    parent_model_id: Optional[int] = None
 
 
 class ModelDisplay(BaseModel):
@@ -168,13 +216,17 @@ class ModelDisplay(BaseModel):
         model_id (int): Unique identifier for the model.
         model_name (str): Name of the model.
         model_artifact_path (str): Path to the model artifact.
+        model_format (str): Serialization format of the artifact.
         date_id (int): Identifier for the date.
+        parent_model_id (Optional[int]): The base model it was fine-tuned from.
     """
 
     model_id: int
     model_name: str
     model_artifact_path: str
+    model_format: ModelFormat
     date_id: int
+    parent_model_id: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -253,3 +305,148 @@ class PageModelInference(BaseModel):
     page: int
     page_size: int
     data: List[ModelInferenceRead]
+
+
+class StageTiming(BaseModel):
+    """
+    Model for the wall time and peak memory of one training stage.
+
+    Attributes:
+        seconds (float): Wall time of the stage.
+        peak_rss_bytes (int): Highest resident memory while the stage ran.
+    """
+
+    seconds: float
+    peak_rss_bytes: int
+
+
+class TrainingSessionCreate(BaseModel):
+    """
+    Request model for recording a training session.
+
+    Attributes:
+        model_id (int): Unique identifier for the trained model.
+        date_id (Optional[int]): Identifier for the date the model was trained.
+        stock_ids (Optional[List[int]]): Stock IDs used in the training session.
+        stage_timings (Optional[Dict[str, StageTiming]]): Metrics of every training
+            stage.
+        average_mae (Optional[float]): Mean absolute error of the trained model.
+    """
+
+    model_id: int
+    date_id: Optional[int] = None
+    stock_ids: Optional[List[int]] = None
+    stage_timings: Optional[Dict[str, StageTiming]] = None
+    average_mae: Optional[float] = None
+
+
+class TrainingSessionRead(TrainingSessionCreate):
+    """
+    Model for reading a training session.
+
+    Attributes:
+        training_session_id (int): Unique identifier for the training session.
+    """
+
+    training_session_id: int
+
+    class Config:
+        orm_mode = True
+
+
+class PageTrainingSession(BaseModel):
+    """
+    Model for paginated responses of Training Sessions.
+
+    Attributes:
+        total_results (int): Total number of results.
+        total_pages (int): Total number of pages.
+        page (int): Current page number.
+        page_size (int): Number of results per page.
+        data (List[TrainingSessionRead]): List of training session reads.
+    """
+
+    total_results: int
+    total_pages: int
+    page: int
+    page_size: int
+    data: List[TrainingSessionRead]
+
+
+class PredictionBulkCreate(BaseModel):
+    """
+    Request model for loading the predictions of one model inference in bulk.
+
+    The per-row values are sent as equally long columns to keep the payload small.
+
+    Attributes:
+        model_id (int): Unique identifier for the model.
+        date_id (int): Identifier for the date.
+        stock_id (List[int]): Stock ID of each row.
+        seconds_in_bucket (List[int]): Seconds in bucket of each row.
+        prediction (List[float]): Prediction of each row.
+        target (Optional[List[Optional[float]]]): Actual target of each row, if known.
+    """
+
+    model_id: int
+    date_id: int
+    stock_id: List[int]
+    seconds_in_bucket: List[int]
+    prediction: List[float]
+    target: Optional[List[Optional[float]]] = None
+
+
+class PredictionRead(BaseModel):
+    """
+    Model for reading a Prediction row.
+
+    Attributes:
+        model_id (int): Unique identifier for the model.
+        date_id (int): Identifier for the date.
+        stock_id (int): Identifier for the stock.
+        seconds_in_bucket (int): Number of seconds in the bucket.
+        prediction (float): Predicted target.
+        target (Optional[float]): Actual target, if known.
+    """
+
+    model_id: int
+    date_id: int
+    stock_id: int
+    seconds_in_bucket: int
+    prediction: float
+    target: Optional[float] = None
+
+    class Config:
+        orm_mode = True
+
+
+class PagePrediction(BaseModel):
+    """
+    Model for paginated responses of Predictions.
+
+    Attributes:
+        total_results (int): Total number of results.
+        total_pages (int): Total number of pages.
+        page (int): Current page number.
+        page_size (int): Number of results per page.
+        data (List[PredictionRead]): List of prediction rows.
+    """
+
+    total_results: int
+    total_pages: int
+    page: int
+    page_size: int
+    data: List[PredictionRead]
+
+
+class PredictionColumns(BaseModel):
+    """
+    Columnar response of Predictions, one list per column.
+
+    Attributes:
+        total_results (int): Total number of rows.
+        data (Dict[str, List[Any]]): Column name to column values.
+    """
+
+    total_results: int
+    data: Dict[str, List[Any]]
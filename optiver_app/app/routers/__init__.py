@@ -1,3 +1,17 @@
-from . import date_mappings, stock_data, models, model_inferences
+from . import (
+    date_mappings,
+    stock_data,
+    models,
+    model_inferences,
+    predictions,
+    training_sessions,
+)
 
-__all__ = ["date_mappings", "stock_data", "models", "model_inferences"]
+__all__ = [
+    "date_mappings",
+    "stock_data",
+    "models",
+    "model_inferences",
+    "predictions",
+    "training_sessions",
+]
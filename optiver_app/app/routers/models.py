@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import literal
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app.models import ModelCreate, PageModelRequest
+from app.models import ModelCreate, ModelDisplay, PageModelRequest
 from app.schema import Model
-from typing import Optional
+from typing import List, Optional
 import logging
 
 # Configure logger
@@ -18,47 +20,124 @@ async def create_model(model: ModelCreate, db: Session = Depends(get_db)):
     """
     Create a new model record in the database.
 
+    The insert is a single ``INSERT ... ON CONFLICT DO NOTHING`` against the unique
+    index on ``model_name``, so concurrent training jobs cannot race each other.
+
     Args:
         model (ModelCreate): The model data to be created.
         db (Session): Database session dependency.
 
     Returns:
-        dict: A message indicating the model was created successfully.
+        dict: A message indicating the model was created successfully and its ID.
 
     Raises:
         HTTPException: If a model with the same name already exists.
     """
     logger.info("Attempting to create a new model.")
-    # Check if a model with the same name already exists
-    existing_model = (
-        db.query(Model).filter(Model.model_name == model.model_name).first()
-    )
-    if existing_model:
-        logger.warning(f"Model with name {model.model_name} already exists.")
-        raise HTTPException(status_code=400, detail="Model already exists")
-
-    # Create a new Model instance
-    new_model = Model(
-        model_name=model.model_name,
-        model_artifact_path=model.model_artifact_path,
-        date_id=model.date_id,
+    statement = (
+        insert(Model)
+        .values(
+            model_name=model.model_name,
+            model_artifact_path=model.model_artifact_path,
+            model_format=model.model_format,
+            date_id=model.date_id,
+            parent_model_id=model.parent_model_id,
+        )
+        .on_conflict_do_nothing(index_elements=[Model.model_name])
+        .returning(Model.model_id)
     )
-    db.add(new_model)
     try:
-        # Commit the transaction to save the record in the database
+        # Insert unless the name is taken, then commit the transaction
+        model_id = db.execute(statement).scalar()
         db.commit()
-        logger.info(f"Model {model.model_name} created successfully.")
     except IntegrityError:
         # Rollback the transaction in case of an integrity error
         db.rollback()
         logger.error(f"Integrity error creating model {model.model_name}.")
         raise HTTPException(
-            status_code=400, detail="Model with this name already exists"
+            status_code=400,
+            detail="Could not create model. Missing date mapping or parent model.",
+        )
+
+    if model_id is None:
+        logger.warning(f"Model with name {model.model_name} already exists.")
+        raise HTTPException(status_code=400, detail="Model already exists")
+
+    logger.info(f"Model {model.model_name} created successfully.")
+    return {"message": "Model Created successfully.", "model_id": model_id}
+
+
+@router.get("/models/latest", response_model=ModelDisplay)
+def read_latest_model(db: Session = Depends(get_db)):
+    """
+    Retrieve the model trained on the most recent date.
+
+    Uses the index on ``date_id``, so the lookup does not scan the registry.
+
+    Args:
+        db (Session): Database session dependency.
+
+    Returns:
+        ModelDisplay: The model with the highest date ID.
+
+    Raises:
+        HTTPException: If no models are found.
+    """
+    logger.info("Reading the latest model.")
+    latest_model = (
+        db.query(Model).order_by(Model.date_id.desc(), Model.model_id.desc()).first()
+    )
+    if latest_model is None:
+        logger.warning("No models found.")
+        raise HTTPException(status_code=404, detail="No Models Found.")
+
+    logger.info(
+        f"Latest model is {latest_model.model_name} for date_id {latest_model.date_id}."
+    )
+    return latest_model
+
+
+@router.get("/models/{model_id}/lineage", response_model=List[ModelDisplay])
+def read_model_lineage(model_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieve a model and the chain of base models it was fine-tuned from.
+
+    The chain is walked with one recursive query over ``parent_model_id``.
+
+    Args:
+        model_id (int): ID of the model.
+        db (Session): Database session dependency.
+
+    Returns:
+        List[ModelDisplay]: The model first, then its parent, grandparent and so
+            on up to the first model of the chain.
+
+    Raises:
+        HTTPException: If the model is not found.
+    """
+    logger.info(f"Reading the lineage of model {model_id}.")
+    lineage = (
+        db.query(Model.model_id, Model.parent_model_id, literal(0).label("depth"))
+        .filter(Model.model_id == model_id)
+        .cte(name="lineage", recursive=True)
+    )
+    lineage = lineage.union_all(
+        db.query(Model.model_id, Model.parent_model_id, lineage.c.depth + 1).filter(
+            Model.model_id == lineage.c.parent_model_id
         )
+    )
+    results = (
+        db.query(Model)
+        .join(lineage, Model.model_id == lineage.c.model_id)
+        .order_by(lineage.c.depth)
+        .all()
+    )
+    if not results:
+        logger.warning(f"Model {model_id} not found.")
+        raise HTTPException(status_code=404, detail="No Models Found.")
 
-    # Refresh the instance to get the generated ID and other fields
-    db.refresh(new_model)
-    return {"message": "Model Created successfully."}
+    logger.info(f"Model {model_id} has {len(results) - 1} ancestors.")
+    return results
 
 
 @router.get("/models/", response_model=PageModelRequest)
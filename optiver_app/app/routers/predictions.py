@@ -0,0 +1,184 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.database import get_db
+from app.models import PredictionBulkCreate, PagePrediction, PredictionColumns
+from app.schema import Prediction
+from typing import List, Optional, Literal, Union
+import logging
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+router = APIRouter()
+
+# Columns of the columnar output; model_id is fixed by the query
+PREDICTION_COLUMNS = [
+    "date_id",
+    "stock_id",
+    "seconds_in_bucket",
+    "prediction",
+    "target",
+]
+
+
+@router.post("/predictions/")
+def create_predictions(request: PredictionBulkCreate, db: Session = Depends(get_db)):
+    """
+    Load the predictions of one model inference in bulk.
+
+    Existing predictions for the same model and date are replaced, so re-running
+    an inference does not duplicate rows.
+
+    Args:
+        request (PredictionBulkCreate): The predictions to be loaded.
+        db (Session): Database session dependency.
+
+    Returns:
+        dict: A message and the number of rows loaded.
+
+    Raises:
+        HTTPException: If the columns differ in length or the insert fails.
+    """
+    num_rows = len(request.prediction)
+    column_lengths = {len(request.stock_id), len(request.seconds_in_bucket), num_rows}
+    if request.target is not None:
+        column_lengths.add(len(request.target))
+    if len(column_lengths) != 1:
+        logger.warning("Prediction columns differ in length.")
+        raise HTTPException(
+            status_code=400, detail="All prediction columns must have the same length."
+        )
+
+    logger.info(
+        f"Loading {num_rows} predictions for model {request.model_id}, date_id {request.date_id}."
+    )
+    targets = request.target if request.target is not None else [None] * num_rows
+    rows = [
+        {
+            "model_id": request.model_id,
+            "date_id": request.date_id,
+            "stock_id": stock_id,
+            "seconds_in_bucket": seconds_in_bucket,
+            "prediction": prediction,
+            "target": target,
+        }
+        for stock_id, seconds_in_bucket, prediction, target in zip(
+            request.stock_id, request.seconds_in_bucket, request.prediction, targets
+        )
+    ]
+    try:
+        # Replace any previous load, then insert all rows as one executemany
+        db.execute(
+            delete(Prediction).where(
+                Prediction.model_id == request.model_id,
+                Prediction.date_id == request.date_id,
+            )
+        )
+        if rows:
+            db.execute(insert(Prediction), rows)
+        db.commit()
+        logger.info(f"Loaded {num_rows} predictions.")
+        return {"message": "Predictions loaded successfully.", "total_results": num_rows}
+    except IntegrityError as e:
+        db.rollback()
+        logger.warning(f"Integrity error loading predictions: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail="Could not load predictions. Missing model or date mapping.",
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"SQLAlchemy error loading predictions: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@router.get("/predictions/", response_model=Union[PagePrediction, PredictionColumns])
+def read_predictions(
+    model_id: int = Query(..., description="Model ID"),
+    date_id: Optional[int] = Query(None, description="Date ID"),
+    stock_id: Optional[List[int]] = Query(None, description="Filter by Stock IDs"),
+    format: Literal["rows", "columnar"] = Query(
+        "rows", description="Paginated rows or one list per column"
+    ),
+    db: Session = Depends(get_db),
+    page: int = Query(1, description="Page number"),
+    page_size: int = Query(10, description="Number of results per page"),
+):
+    """
+    Retrieve predictions of a model, optionally for one date and a set of stocks.
+
+    Rows are returned in (date_id, stock_id, seconds_in_bucket) order. The columnar
+    format returns every matching row at once, one list per column, without
+    pagination.
+
+    Args:
+        model_id (int): Filter by model ID.
+        date_id (Optional[int]): Filter by date ID.
+        stock_id (Optional[List[int]]): Filter by stock IDs.
+        format (str): "rows" for paginated rows, "columnar" for column lists.
+        db (Session): Database session dependency.
+        page (int): Page number for pagination.
+        page_size (int): Number of results per page for pagination.
+
+    Returns:
+        Union[PagePrediction, PredictionColumns]: The matching predictions.
+
+    Raises:
+        HTTPException: If no predictions are found.
+    """
+    logger.info(f"Reading predictions for model {model_id} with provided filters.")
+    # Initialize the query on the Prediction model
+    query = db.query(Prediction).filter(Prediction.model_id == model_id)
+
+    # Apply filters if provided
+    if date_id is not None:
+        query = query.filter(Prediction.date_id == date_id)
+    if stock_id:
+        query = query.filter(Prediction.stock_id.in_(stock_id))
+    query = query.order_by(
+        Prediction.date_id, Prediction.stock_id, Prediction.seconds_in_bucket
+    )
+
+    if format == "columnar":
+        # Fetch plain tuples instead of ORM objects and transpose them into columns
+        results = query.with_entities(
+            *[getattr(Prediction, column) for column in PREDICTION_COLUMNS]
+        ).all()
+        if not results:
+            logger.warning("No predictions found.")
+            raise HTTPException(status_code=404, detail="No predictions found.")
+
+        columns = [list(values) for values in zip(*results)]
+        logger.info(f"Retrieved {len(results)} predictions in columnar format.")
+        return {
+            "total_results": len(results),
+            "data": dict(zip(PREDICTION_COLUMNS, columns)),
+        }
+
+    # Count the total number of results matching the query
+    total_results = query.count()
+
+    # Calculate the offset for pagination
+    offset = (page - 1) * page_size
+
+    # Execute the paginated query and retrieve the results
+    results = query.offset(offset).limit(page_size).all()
+
+    # Raise an HTTPException if no results are found
+    if not results:
+        logger.warning("No predictions found.")
+        raise HTTPException(status_code=404, detail="No predictions found.")
+
+    # Calculate the total number of pages
+    total_pages = (total_results + page_size - 1) // page_size
+
+    logger.info(f"Retrieved {len(results)} predictions, page {page} of {total_pages}.")
+    return {
+        "total_results": total_results,
+        "total_pages": total_pages,
+        "page": page,
+        "page_size": page_size,
+        "data": results,
+    }
@@ -1,10 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models import StockDataQueryParams, PageRequest, IngestRequest
+from app.models import (
+    StockDataQueryParams,
+    PageRequest,
+    IngestRequest,
+    StockDayBlockResponse,
+    StockSeriesResponse,
+)
 from app.schema import StockData
-from app.utils import clean_nan_values
+from app.utils import clean_nan_values, lttb_indices
 from app.crud import get_or_create_date
+from app.tick_blocks import BLOCK_COLUMNS, decode_block, get_block
+from typing import List, Optional, Literal
+import numpy as np
 import logging
 
 # Configure logger
@@ -12,6 +21,21 @@ logger = logging.getLogger("optiver." + __name__)
 
 router = APIRouter()
 
+# Columns that can be requested as a chart series
+SeriesColumn = Literal[
+    "target",
+    "wap",
+    "reference_price",
+    "far_price",
+    "near_price",
+    "bid_price",
+    "ask_price",
+    "imbalance_size",
+    "matched_size",
+    "bid_size",
+    "ask_size",
+]
+
 
 @router.get("/stock_data/", response_model=PageRequest)
 def get_stock_data(
@@ -95,6 +119,131 @@ def get_stock_data(
     }
 
 
+@router.get("/stock_data/series", response_model=StockSeriesResponse)
+def get_stock_series(
+    stock_id: int = Query(..., description="Stock ID"),
+    start_date_id: int = Query(..., description="Start of the date ID range"),
+    end_date_id: int = Query(..., description="End of the date ID range"),
+    column: SeriesColumn = Query("target", description="Column to return"),
+    max_points: int = Query(500, ge=3, description="Maximum number of points"),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieve one column of a stock over a date range, downsampled for charting.
+
+    The series is read in time order and reduced on the server to at most
+    max_points points with a vectorized LTTB, so the payload size does not grow
+    with the requested span. Missing values are skipped.
+
+    Args:
+        stock_id (int): Identifier for the stock.
+        start_date_id (int): Start of the date ID range.
+        end_date_id (int): End of the date ID range.
+        column (str): Column to return.
+        max_points (int): Maximum number of points to return.
+        db (Session): Database session dependency.
+
+    Returns:
+        StockSeriesResponse: The downsampled series.
+
+    Raises:
+        HTTPException: If no stock data is found matching the criteria.
+    """
+    logger.info(
+        f"Fetching {column} series for stock_id: {stock_id}, date_ids: {start_date_id}-{end_date_id}."
+    )
+    rows = (
+        db.query(StockData)
+        .with_entities(
+            StockData.date_id,
+            StockData.seconds_in_bucket,
+            getattr(StockData, column),
+        )
+        .filter(
+            StockData.stock_id == stock_id,
+            StockData.date_id.between(start_date_id, end_date_id),
+        )
+        .order_by(StockData.date_id, StockData.seconds_in_bucket)
+        .all()
+    )
+    if not rows:
+        logger.warning("No stock data found matching the criteria.")
+        raise HTTPException(
+            status_code=404, detail="No stock data found matching the criteria."
+        )
+
+    date_ids, seconds, values = zip(*rows)
+    date_ids, seconds = np.asarray(date_ids), np.asarray(seconds)
+    # NULLs become NaN and are dropped before downsampling
+    values = np.array(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    date_ids, seconds, values = date_ids[present], seconds[present], values[present]
+
+    selected = lttb_indices(values, max_points)
+    logger.info(f"Downsampled {len(values)} points to {len(selected)}.")
+    return {
+        "stock_id": stock_id,
+        "column": column,
+        "total_points": len(values),
+        "date_id": date_ids[selected].tolist(),
+        "seconds_in_bucket": seconds[selected].tolist(),
+        "value": values[selected].tolist(),
+    }
+
+
+@router.get("/stock_data/block", response_model=StockDayBlockResponse)
+def get_stock_day_block(
+    stock_id: int = Query(..., description="Stock ID"),
+    date_id: int = Query(..., description="Date ID"),
+    columns: Optional[List[str]] = Query(None, description="Columns to return"),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieve all snapshots of one stock on one date from the packed block layout.
+
+    Args:
+        stock_id (int): Identifier for the stock.
+        date_id (int): Identifier for the date.
+        columns (Optional[List[str]]): Packed columns to return, all by default.
+        db (Session): Database session dependency.
+
+    Returns:
+        StockDayBlockResponse: The decoded columns of the block.
+
+    Raises:
+        HTTPException: If a column is unknown or the stock-day has not been packed.
+    """
+    logger.info(f"Fetching block for stock_id: {stock_id}, date_id: {date_id}.")
+    unknown_columns = set(columns or []) - set(BLOCK_COLUMNS)
+    if unknown_columns:
+        logger.warning(f"Unknown block columns requested: {unknown_columns}.")
+        raise HTTPException(
+            status_code=400, detail=f"Unknown columns: {sorted(unknown_columns)}"
+        )
+
+    block = get_block(db, stock_id, date_id)
+    if block is None:
+        logger.warning("No block found matching the criteria.")
+        raise HTTPException(
+            status_code=404, detail="No block found matching the criteria."
+        )
+
+    df = decode_block(block, columns)
+    # NaN is not valid JSON, return missing values as null
+    df = df.astype(object).where(df.notna(), None)
+
+    logger.info(f"Decoded block with {block.num_rows} rows.")
+    return {
+        "stock_id": block.stock_id,
+        "date_id": block.date_id,
+        "train_type": block.train_type,
+        "num_rows": block.num_rows,
+        "data": df.drop(columns=["stock_id", "date_id", "train_type"]).to_dict(
+            orient="list"
+        ),
+    }
+
+
 @router.post("/stock_data/")
 async def ingest_data(request: IngestRequest, db: Session = Depends(get_db)):
     """
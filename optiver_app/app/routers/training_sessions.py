@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.database import get_db
+from app.models import PageTrainingSession, TrainingSessionCreate, TrainingSessionRead
+from app.schema import TrainingSession
+from typing import Optional
+import logging
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+router = APIRouter()
+
+
+@router.post("/training-sessions/", response_model=TrainingSessionRead)
+def create_training_session(
+    training_session: TrainingSessionCreate, db: Session = Depends(get_db)
+):
+    """
+    Record the stage timings and MAE of a training job.
+
+    Args:
+        training_session (TrainingSessionCreate): The training session to be recorded.
+        db (Session): Database session dependency.
+
+    Returns:
+        TrainingSessionRead: The recorded training session.
+
+    Raises:
+        HTTPException: If the model or date mapping is missing or the insert fails.
+    """
+    try:
+        db_training_session = TrainingSession(**training_session.dict())
+        db.add(db_training_session)
+        db.commit()
+        db.refresh(db_training_session)
+        logger.info(
+            f"Created training session {db_training_session.training_session_id} "
+            f"for model {training_session.model_id}."
+        )
+        return db_training_session
+    except IntegrityError as e:
+        db.rollback()
+        logger.warning(f"Integrity error creating training session: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail="Could not create training session. Missing model or date mapping.",
+        )
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"SQLAlchemy error creating training session: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+@router.get("/training-sessions/", response_model=PageTrainingSession)
+def read_training_sessions(
+    model_id: Optional[int] = Query(None, description="Model ID"),
+    date_id: Optional[int] = Query(None, description="Date ID"),
+    db: Session = Depends(get_db),
+    page: int = Query(1, description="Page number"),
+    page_size: int = Query(10, description="Number of results per page"),
+):
+    """
+    Retrieve a paginated list of training sessions, oldest date first.
+
+    Args:
+        model_id (Optional[int]): Filter by model ID.
+        date_id (Optional[int]): Filter by date ID.
+        db (Session): Database session dependency.
+        page (int): Page number for pagination.
+        page_size (int): Number of results per page for pagination.
+
+    Returns:
+        PageTrainingSession: A paginated response containing the training sessions.
+
+    Raises:
+        HTTPException: If no training sessions are found.
+    """
+    query = db.query(TrainingSession)
+
+    # Apply filters if provided
+    if model_id is not None:
+        query = query.filter(TrainingSession.model_id == model_id)
+    if date_id is not None:
+        query = query.filter(TrainingSession.date_id == date_id)
+    query = query.order_by(
+        TrainingSession.date_id, TrainingSession.training_session_id
+    )
+
+    # Count the total number of results matching the query
+    total_results = query.count()
+
+    # Execute the paginated query and retrieve the results
+    offset = (page - 1) * page_size
+    results = query.offset(offset).limit(page_size).all()
+
+    if not results:
+        logger.warning("No training sessions found.")
+        raise HTTPException(status_code=404, detail="No training sessions found.")
+
+    total_pages = (total_results + page_size - 1) // page_size
+
+    logger.info(
+        f"Retrieved {len(results)} training sessions, page {page} of {total_pages}."
+    )
+    return {
+        "total_results": total_results,
+        "total_pages": total_pages,
+        "page": page,
+        "page_size": page_size,
+        "data": results,
+    }
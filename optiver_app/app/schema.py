@@ -6,7 +6,17 @@ warnings.filterwarnings("ignore")
 import argparse
 import logging
 import logging.config
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, JSON
+from sqlalchemy import (
+    Column,
+    Integer,
+    Float,
+    String,
+    Date,
+    ForeignKey,
+    JSON,
+    Index,
+    LargeBinary,
+)
 from sqlalchemy.orm import relationship, backref
 from app.base import Base
 
@@ -70,6 +80,9 @@ class StockData(Base):
         "DateMapping", backref=backref("stock_data", cascade="all, delete-orphan")
     )
 
+    # Serves per-stock range scans such as chart series
+    __table_args__ = (Index("ix_stock_data_stock_id_date_id", stock_id, date_id),)
+
 
 class DateMapping(Base):
     """
@@ -94,6 +107,8 @@ class TrainingSession(Base):
         model_id (int): Foreign key linking to model.
         date_id (int): Foreign key linking to date_mapping.
         stock_ids (JSON): JSON list of stock IDs used in the training session.
+        stage_timings (JSON): Wall time and peak memory of every training stage.
+        average_mae (float): Mean absolute error of the trained model.
         date_mapping (DateMapping): Relationship to DateMapping.
         model (Model): Relationship to Model.
     """
@@ -103,6 +118,8 @@ class TrainingSession(Base):
     model_id = Column(Integer, ForeignKey("model.model_id"), nullable=False)
     date_id = Column(Integer, ForeignKey("date_mapping.date_id"))
     stock_ids = Column(JSON)
+    stage_timings = Column(JSON)
+    average_mae = Column(Float)
     date_mapping = relationship(
         "DateMapping", backref=backref("training_session", cascade="all, delete-orphan")
     )
@@ -117,21 +134,29 @@ class Model(Base):
 
     Attributes:
         model_id (int): Primary key, auto-incremented.
-        model_name (str): Name of the model.
+        model_name (str): Unique name of the model, indexed.
         model_artifact_path (str): Path to the model artifact.
-        date_id (int): Foreign key linking to date_mapping.
+        model_format (str): Serialization format of the artifact.
+        date_id (int): Foreign key linking to date_mapping, indexed with model_id.
+            The last day the model was trained on.
+        parent_model_id (int): The base model this model was fine-tuned from, if any.
         date_mapping (DateMapping): Relationship to DateMapping.
     """
 
     __tablename__ = "model"
     model_id = Column(Integer, primary_key=True, autoincrement=True)
-    model_name = Column(String(255), nullable=False)
+    model_name = Column(String(255), nullable=False, unique=True, index=True)
     model_artifact_path = Column(String(255), nullable=False)
+    model_format = Column(String(16), nullable=False, server_default="pickle")
     date_id = Column(Integer, ForeignKey("date_mapping.date_id"), nullable=False)
+    parent_model_id = Column(Integer, ForeignKey("model.model_id"), nullable=True)
     date_mapping = relationship(
         "DateMapping", backref=backref("Model", cascade="all, delete-orphan")
     )
 
+    # Serves "latest model" lookups without scanning the registry
+    __table_args__ = (Index("ix_model_date_id_model_id", date_id, model_id),)
+
 
 class ModelInference(Base):
     """
@@ -159,6 +184,113 @@ class ModelInference(Base):
     )
 
 
+class Prediction(Base):
+    """
+    Stores one prediction row per stock and time bucket for a model inference.
+
+    Attributes:
+        id (int): Primary key, auto-incremented.
+        model_id (int): Foreign key linking to model.
+        date_id (int): Foreign key linking to date_mapping.
+        stock_id (int): Identifier for the stock.
+        seconds_in_bucket (int): Number of seconds in the bucket.
+        prediction (float): Predicted target.
+        target (float): Actual target, if known.
+        model (Model): Relationship to Model.
+        date_mapping (DateMapping): Relationship to DateMapping.
+    """
+
+    __tablename__ = "prediction"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    model_id = Column(Integer, ForeignKey("model.model_id"), nullable=False)
+    date_id = Column(Integer, ForeignKey("date_mapping.date_id"), nullable=False)
+    stock_id = Column(Integer, nullable=False)
+    seconds_in_bucket = Column(Integer, nullable=False)
+    prediction = Column(Float, nullable=False)
+    target = Column(Float)
+    model = relationship(
+        "Model", backref=backref("prediction", cascade="all, delete-orphan")
+    )
+    date_mapping = relationship(
+        "DateMapping", backref=backref("prediction", cascade="all, delete-orphan")
+    )
+
+    # Serves per-(model, day, stock) lookups in bucket order
+    __table_args__ = (
+        Index(
+            "ix_prediction_model_date_stock",
+            model_id,
+            date_id,
+            stock_id,
+            seconds_in_bucket,
+        ),
+    )
+
+
+class StockDayBlock(Base):
+    """
+    Stores one stock's order book snapshots for one day as compressed column arrays.
+
+    An optional, compact layout of ``stock_data``: each column of a (stock_id,
+    date_id) series is packed into one compressed array, see ``app.tick_blocks``
+    for the encode/decode helpers.
+
+    Attributes:
+        id (int): Primary key, auto-incremented.
+        stock_id (int): Identifier for the stock.
+        date_id (int): Foreign key linking to date_mapping.
+        train_type (str): Type of training of the packed rows.
+        num_rows (int): Number of snapshots in the block.
+        seconds_in_bucket (bytes): Compressed int16 array.
+        imbalance_buy_sell_flag (bytes): Compressed int16 array.
+        time_id (bytes): Compressed int32 array.
+        imbalance_size (bytes): Compressed float32 array.
+        reference_price (bytes): Compressed float32 array.
+        matched_size (bytes): Compressed float32 array.
+        far_price (bytes): Compressed float32 array.
+        near_price (bytes): Compressed float32 array.
+        bid_price (bytes): Compressed float32 array.
+        bid_size (bytes): Compressed float32 array.
+        ask_price (bytes): Compressed float32 array.
+        ask_size (bytes): Compressed float32 array.
+        wap (bytes): Compressed float32 array.
+        target (bytes): Compressed float32 array.
+        date_mapping (DateMapping): Relationship to DateMapping.
+    """
+
+    __tablename__ = "stock_day_block"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, nullable=False)
+    date_id = Column(
+        Integer, ForeignKey("date_mapping.date_id", ondelete="CASCADE"), nullable=False
+    )
+    train_type = Column(String(20))
+    num_rows = Column(Integer, nullable=False)
+    seconds_in_bucket = Column(LargeBinary, nullable=False)
+    imbalance_buy_sell_flag = Column(LargeBinary, nullable=False)
+    time_id = Column(LargeBinary, nullable=False)
+    imbalance_size = Column(LargeBinary, nullable=False)
+    reference_price = Column(LargeBinary, nullable=False)
+    matched_size = Column(LargeBinary, nullable=False)
+    far_price = Column(LargeBinary, nullable=False)
+    near_price = Column(LargeBinary, nullable=False)
+    bid_price = Column(LargeBinary, nullable=False)
+    bid_size = Column(LargeBinary, nullable=False)
+    ask_price = Column(LargeBinary, nullable=False)
+    ask_size = Column(LargeBinary, nullable=False)
+    wap = Column(LargeBinary, nullable=False)
+    target = Column(LargeBinary, nullable=False)
+    date_mapping = relationship(
+        "DateMapping",
+        backref=backref("stock_day_block", cascade="all, delete-orphan"),
+    )
+
+    # A whole stock-day is read with a single unique index lookup
+    __table_args__ = (
+        Index("ix_stock_day_block_stock_date", stock_id, date_id, unique=True),
+    )
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--create-schema", action="store_true", help="Create DB Schema")
@@ -166,7 +298,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
     if args.create_schema:
         logger.info("Creating DB Schema")
-        from database import engine
+        from app.database import engine
 
         Base.metadata.create_all(bind=engine)
         logger.info("DB Schema created successfully.")
@@ -0,0 +1,222 @@
+import argparse
+import logging
+import logging.config
+import zlib
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from app.schema import StockData, StockDayBlock
+
+# Configure logger
+logging.config.fileConfig(
+    "app/configs/logging/local.ini", disable_existing_loggers=False
+)
+logger = logging.getLogger("optiver." + __name__)
+
+# Packed columns of a block and the dtype of their arrays
+BLOCK_COLUMNS = {
+    "seconds_in_bucket": np.int16,
+    "imbalance_buy_sell_flag": np.int16,
+    "time_id": np.int32,
+    "imbalance_size": np.float32,
+    "reference_price": np.float32,
+    "matched_size": np.float32,
+    "far_price": np.float32,
+    "near_price": np.float32,
+    "bid_price": np.float32,
+    "bid_size": np.float32,
+    "ask_price": np.float32,
+    "ask_size": np.float32,
+    "wap": np.float32,
+    "target": np.float32,
+}
+
+COMPRESSION_LEVEL = 6
+
+
+def encode_array(values, dtype) -> bytes:
+    """
+    Pack values into a compressed little-endian array.
+
+    The bytes are shuffled before compression so that the n-th byte of every value
+    is stored together; consecutive snapshots share their high-order bytes, which
+    compresses much better than the interleaved layout.
+
+    Args:
+        values (array-like): The values to pack.
+        dtype (np.dtype): The dtype of the packed array.
+
+    Returns:
+        bytes: The compressed array.
+    """
+    array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    shuffled = array.view(np.uint8).reshape(-1, array.itemsize).T.tobytes()
+    return zlib.compress(shuffled, COMPRESSION_LEVEL)
+
+
+def decode_array(blob: bytes, dtype, num_rows: int) -> np.ndarray:
+    """
+    Unpack an array packed with ``encode_array``.
+
+    Args:
+        blob (bytes): The compressed array.
+        dtype (np.dtype): The dtype of the packed array.
+        num_rows (int): Number of values in the array.
+
+    Returns:
+        np.ndarray: The unpacked values.
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    shuffled = np.frombuffer(zlib.decompress(blob), dtype=np.uint8)
+    return shuffled.reshape(dtype.itemsize, num_rows).T.copy().view(dtype).ravel()
+
+
+def encode_block(df: pd.DataFrame) -> dict:
+    """
+    Pack the snapshots of one (stock_id, date_id) series into block columns.
+
+    Args:
+        df (pd.DataFrame): Stock data rows of a single stock and date.
+
+    Returns:
+        dict: The column values of a StockDayBlock row.
+    """
+    df = df.sort_values("seconds_in_bucket")
+    block = {
+        "stock_id": int(df["stock_id"].iloc[0]),
+        "date_id": int(df["date_id"].iloc[0]),
+        "train_type": df["train_type"].iloc[0] if "train_type" in df else None,
+        "num_rows": len(df),
+    }
+    for column, dtype in BLOCK_COLUMNS.items():
+        block[column] = encode_array(df[column].to_numpy(dtype=dtype), dtype)
+    return block
+
+
+def decode_block(block: StockDayBlock, columns=None) -> pd.DataFrame:
+    """
+    Unpack a block into stock data rows.
+
+    Args:
+        block (StockDayBlock): The block to unpack.
+        columns (Optional[List[str]]): Packed columns to decode, all by default.
+
+    Returns:
+        pd.DataFrame: One row per snapshot with the ``stock_data`` columns.
+    """
+    columns = list(BLOCK_COLUMNS) if columns is None else columns
+    seconds_in_bucket = decode_array(
+        block.seconds_in_bucket, BLOCK_COLUMNS["seconds_in_bucket"], block.num_rows
+    )
+    df = pd.DataFrame(
+        {
+            "stock_id": np.full(block.num_rows, block.stock_id, dtype=np.int32),
+            "date_id": np.full(block.num_rows, block.date_id, dtype=np.int32),
+            "seconds_in_bucket": seconds_in_bucket,
+        }
+    )
+    for column in columns:
+        if column != "seconds_in_bucket":
+            df[column] = decode_array(
+                getattr(block, column), BLOCK_COLUMNS[column], block.num_rows
+            )
+    df["row_id"] = [
+        f"{block.date_id}_{seconds}_{block.stock_id}" for seconds in seconds_in_bucket
+    ]
+    df["train_type"] = block.train_type
+    return df
+
+
+def get_block(db: Session, stock_id: int, date_id: int) -> StockDayBlock:
+    """
+    Retrieve the block of one stock and date.
+
+    Args:
+        db (Session): The database session.
+        stock_id (int): Identifier for the stock.
+        date_id (int): Identifier for the date.
+
+    Returns:
+        StockDayBlock: The block, or None if the stock-day has not been packed.
+    """
+    return db.query(StockDayBlock).filter_by(stock_id=stock_id, date_id=date_id).first()
+
+
+def build_blocks(db: Session, date_id: int, train_type: str = "prod") -> int:
+    """
+    Pack the stock data rows of one date into blocks, replacing existing blocks.
+
+    Args:
+        db (Session): The database session.
+        date_id (int): Identifier for the date to pack.
+        train_type (str): Type of training of the rows to pack.
+
+    Returns:
+        int: The number of blocks written.
+    """
+    logger.info(f"Building blocks for date_id: {date_id}, train_type: {train_type}.")
+    columns = ["stock_id", "date_id", "train_type"] + list(BLOCK_COLUMNS)
+    rows = (
+        db.query(StockData)
+        .with_entities(*[getattr(StockData, column) for column in columns])
+        .filter(StockData.date_id == date_id, StockData.train_type == train_type)
+        .all()
+    )
+    if not rows:
+        logger.warning(f"No stock data found for date_id: {date_id}.")
+        return 0
+
+    df = pd.DataFrame(rows, columns=columns)
+    blocks = [encode_block(group) for _, group in df.groupby("stock_id")]
+
+    statement = insert(StockDayBlock).values(blocks)
+    statement = statement.on_conflict_do_update(
+        index_elements=[StockDayBlock.stock_id, StockDayBlock.date_id],
+        set_={
+            column: statement.excluded[column]
+            for column in ["train_type", "num_rows"] + list(BLOCK_COLUMNS)
+        },
+    )
+    db.execute(statement)
+    logger.info(f"Built {len(blocks)} blocks for date_id: {date_id}.")
+    return len(blocks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--start-date-id", type=int, required=True, help="First date ID to pack."
+    )
+    parser.add_argument(
+        "--end-date-id", type=int, required=True, help="Last date ID to pack."
+    )
+    parser.add_argument(
+        "--train-type",
+        type=str,
+        default="prod",
+        help="Type of training of the rows to pack.",
+    )
+    parser.add_argument(
+        "--commit",
+        action="store_true",
+        help="If provided, commit the blocks to the database.",
+    )
+
+    args = parser.parse_args()
+    logger.info(
+        f"Date IDs: {args.start_date_id}-{args.end_date_id}, Train Type: {args.train_type}, Commit: {args.commit}"
+    )
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    for date_id in range(args.start_date_id, args.end_date_id + 1):
+        build_blocks(db, date_id, args.train_type)
+        if args.commit:
+            db.commit()
+            logger.info(f"Blocks committed for date_id: {date_id}.")
+
+    # Close the session
+    db.close()
+    logger.info("Database session closed.")
@@ -6,6 +6,7 @@ from datetime import date, timedelta
 import json
 from typing import Dict, Any
 import math
+import numpy as np
 import logging
 
 # Configure logger
@@ -114,3 +115,54 @@ def clean_nan_values(item: Dict[str, Any]) -> Dict[str, Any]:
             item[key] = None
             logger.debug(f"Replaced NaN in key {key} with None.")
     return item
+
+
+def lttb_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select at most max_points indices of a series with a vectorized LTTB.
+
+    Largest-Triangle-Three-Buckets keeps the first and last points and, from each
+    of the max_points - 2 buckets in between, the point forming the largest
+    triangle with its neighbouring buckets. Classic LTTB uses the previously
+    selected point as the left vertex, which is inherently sequential; here both
+    neighbouring buckets are represented by their averages so every bucket is
+    solved at once with NumPy. Points are assumed to be evenly spaced.
+
+    Args:
+        y (np.ndarray): The series values, without NaN.
+        max_points (int): The maximum number of points to keep, at least 3.
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points.
+    """
+    num_points = len(y)
+    if num_points <= max_points:
+        return np.arange(num_points)
+
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(num_points, dtype=np.float64)
+
+    # Interior points 1..n-2 split into max_points - 2 non-empty buckets
+    edges = np.linspace(1, num_points - 1, max_points - 1).astype(np.int64)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+
+    # Left and right vertices of each bucket's triangles
+    left_x = np.concatenate(([x[0]], mean_x[:-1]))
+    left_y = np.concatenate(([y[0]], mean_y[:-1]))
+    right_x = np.concatenate((mean_x[1:], [x[-1]]))
+    right_y = np.concatenate((mean_y[1:], [y[-1]]))
+
+    bucket = np.repeat(np.arange(len(counts)), counts)
+    px, py = x[1:-1], y[1:-1]
+    area = np.abs(
+        (left_x[bucket] - right_x[bucket]) * (py - left_y[bucket])
+        - (left_x[bucket] - px) * (right_y[bucket] - left_y[bucket])
+    )
+
+    # Largest area first within each bucket, then take each bucket's first entry
+    order = np.lexsort((-area, bucket))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    selected = order[starts] + 1
+    return np.concatenate(([0], selected, [num_points - 1]))
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from app.utils import lttb_indices
+
+
+@pytest.mark.parametrize("num_points, max_points", [(1000, 100), (550, 3), (101, 100)])
+def test_lttb_keeps_endpoints_and_max_points(num_points, max_points):
+    y = np.random.default_rng(0).normal(size=num_points).cumsum()
+    indices = lttb_indices(y, max_points)
+
+    assert len(indices) == max_points
+    assert indices[0] == 0
+    assert indices[-1] == num_points - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_the_peak_of_a_bucket():
+    y = np.zeros(1000)
+    y[437] = 10.0
+    assert 437 in lttb_indices(y, 50)
+
+
+@pytest.mark.parametrize("num_points", [0, 1, 50, 100])
+def test_lttb_returns_short_series_unchanged(num_points):
+    y = np.arange(num_points, dtype=np.float64)
+    np.testing.assert_array_equal(lttb_indices(y, 100), np.arange(num_points))
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from app.schema import StockDayBlock
+from app.tick_blocks import BLOCK_COLUMNS, decode_block, encode_block
+
+
+def stock_day(num_rows=55, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "stock_id": 3,
+            "date_id": 405,
+            "train_type": "prod",
+            "seconds_in_bucket": np.arange(num_rows) * 10,
+            "imbalance_buy_sell_flag": rng.integers(-1, 2, num_rows),
+            "time_id": 405 * 55 + np.arange(num_rows),
+        }
+    )
+    for column, dtype in BLOCK_COLUMNS.items():
+        if column not in df:
+            values = rng.normal(1, 0.01, num_rows)
+            values[rng.random(num_rows) < 0.3] = np.nan
+            df[column] = values
+    # Rows come out of the database in any order
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def test_block_round_trip_keeps_values_and_nans():
+    df = stock_day()
+    block = StockDayBlock(**encode_block(df))
+
+    decoded = decode_block(block)
+
+    expected = df.sort_values("seconds_in_bucket").reset_index(drop=True)
+    assert block.num_rows == len(df)
+    assert (decoded["stock_id"] == 3).all() and (decoded["date_id"] == 405).all()
+    assert (decoded["train_type"] == "prod").all()
+    assert decoded["row_id"].iloc[1] == "405_10_3"
+    for column, dtype in BLOCK_COLUMNS.items():
+        values = decoded[column].to_numpy()
+        assert values.dtype == dtype
+        np.testing.assert_array_equal(
+            values, expected[column].to_numpy(dtype=dtype), err_msg=column
+        )
+    assert decoded["wap"].isna().any()
+
+
+def test_decode_block_reads_only_requested_columns():
+    block = StockDayBlock(**encode_block(stock_day()))
+
+    decoded = decode_block(block, columns=["wap"])
+
+    assert list(decoded.columns) == [
+        "stock_id",
+        "date_id",
+        "seconds_in_bucket",
+        "wap",
+        "row_id",
+        "train_type",
+    ]
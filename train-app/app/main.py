@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import train, inference
+from app.routers import train, inference, predict, jobs
+from app.services.job_executor import get_job_executor
 import logging
 import logging.config
 
@@ -9,12 +11,24 @@ logging.config.fileConfig(
 )
 logger = logging.getLogger("optiver." + __name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Stop the job worker processes when the service shuts down.
+    """
+    yield
+    get_job_executor().shutdown()
+
+
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Include routers for train and inference endpoints
 app.include_router(train.router)
 app.include_router(inference.router)
+app.include_router(predict.router)
+app.include_router(jobs.router)
 
 
 @app.get("/healthcheck/")
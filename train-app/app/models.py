@@ -1,5 +1,55 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+
+
+class TrainingProfile(BaseModel):
+    """
+    Model for the XGBoost training options of a training job.
+
+    Attributes:
+        tree_method (str): Tree construction algorithm, "hist" or "approx".
+        max_bin (int): Maximum number of histogram bins per feature.
+        nthread (Optional[int]): Threads for the whole job, all cores if not set.
+        learning_rate (float): Boosting learning rate.
+        num_boost_round (int): Number of boosting rounds added to the base model.
+        early_stopping_rounds (int): Rounds without improvement before stopping.
+        n_splits (int): Number of time-series cross-validation folds.
+    """
+
+    tree_method: Literal["hist", "approx"] = Field(
+        "hist", description="Tree construction algorithm"
+    )
+    max_bin: int = Field(256, ge=2, le=1024, description="Histogram bins per feature")
+    nthread: Optional[int] = Field(
+        None, ge=1, description="Threads for the job, all cores if not set"
+    )
+    learning_rate: float = Field(0.01, gt=0, le=1, description="Learning rate")
+    num_boost_round: int = Field(50, ge=1, le=5000, description="Boosting rounds")
+    early_stopping_rounds: int = Field(
+        30, ge=1, description="Rounds without improvement before stopping"
+    )
+    n_splits: int = Field(5, ge=2, le=20, description="Cross-validation folds")
+
+
+# Named training profiles selectable by name from a TrainRequest
+TRAINING_PRESETS = {
+    "default": TrainingProfile(),
+    "fast": TrainingProfile(
+        max_bin=64,
+        learning_rate=0.05,
+        num_boost_round=20,
+        early_stopping_rounds=5,
+        n_splits=3,
+    ),
+    "thorough": TrainingProfile(
+        max_bin=512,
+        learning_rate=0.01,
+        num_boost_round=300,
+        early_stopping_rounds=50,
+        n_splits=5,
+    ),
+}
 
 
 class TrainRequest(BaseModel):
@@ -9,9 +59,19 @@ class TrainRequest(BaseModel):
     Attributes:
         model_id (int): Initial model to be fine-tuned.
         model_name (str): New model name.
-        start_date_id (Optional[int]): Start of the date ID range.
-        end_date_id (Optional[int]): End of the date ID range.
-        date_id (Optional[int]): Specific date ID.
+        start_date_id (Optional[int]): Start of the date ID range; if only
+            end_date_id is given, the day after the base model's last day.
+        end_date_id (Optional[int]): End of the date ID range, required with
+            start_date_id.
+        date_id (Optional[int]): Specific date ID, used when no range is given.
+        validation_days (int): Last days the base model already saw to evaluate
+            on, never trained on again.
+        temporal_features (bool): Train with the per-stock lag and rolling features.
+        training_mode (str): "in_memory" to train on the whole window in memory,
+            "external_memory" to stream it from disk in batches of days, with
+            the "hist" tree method only.
+        profile (TrainingProfile): Training options, given inline or as the name
+            of one of TRAINING_PRESETS.
     """
 
     model_id: int  # initial model to be fine-tuned
@@ -19,6 +79,58 @@ class TrainRequest(BaseModel):
     start_date_id: Optional[int] = Field(None, description="Start of the date ID range")
     end_date_id: Optional[int] = Field(None, description="End of the date ID range")
     date_id: Optional[int] = Field(None, description="Date ID")
+    validation_days: int = Field(
+        0, ge=0, description="Days the base model already saw to evaluate on"
+    )
+    temporal_features: bool = Field(
+        False, description="Train with the per-stock lag and rolling features"
+    )
+    training_mode: Literal["in_memory", "external_memory"] = Field(
+        "in_memory", description="Train in memory or stream the days from disk"
+    )
+    profile: TrainingProfile = Field(
+        default_factory=TrainingProfile,
+        description="Training options or the name of a preset",
+    )
+
+    @field_validator("profile", mode="before")
+    @classmethod
+    def resolve_preset(cls, value):
+        """
+        Replace a preset name with its training profile.
+        """
+        if isinstance(value, str):
+            if value not in TRAINING_PRESETS:
+                raise ValueError(
+                    f"Unknown preset {value!r}, expected one of {list(TRAINING_PRESETS)}"
+                )
+            return TRAINING_PRESETS[value].model_copy()
+        return value
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        """
+        Require an end_date_id or a date_id, and a range that is not reversed.
+        """
+        if self.end_date_id is None:
+            if self.start_date_id is not None:
+                raise ValueError("start_date_id requires an end_date_id")
+            if self.date_id is None:
+                raise ValueError("Give either end_date_id or date_id")
+        elif self.start_date_id is not None and self.start_date_id > self.end_date_id:
+            raise ValueError("start_date_id must not be after end_date_id")
+        return self
+
+    @model_validator(mode="after")
+    def check_training_mode(self):
+        """
+        Require the hist tree method for external memory training, the only one
+        XGBoost's external memory matrices support.
+        """
+        external_memory = self.training_mode == "external_memory"
+        if external_memory and self.profile.tree_method != "hist":
+            raise ValueError('external_memory training requires tree_method "hist"')
+        return self
 
 
 class InferenceRequest(BaseModel):
@@ -32,3 +144,155 @@ class InferenceRequest(BaseModel):
 
     model_id: int
     pred_date_id: int
+
+
+class BatchInferenceRequest(BaseModel):
+    """
+    Model for a batch inference request over several models and days.
+
+    The prediction days are given either as a list or as an inclusive range.
+
+    Attributes:
+        model_ids (List[int]): IDs of the models to use for inference.
+        pred_date_ids (Optional[List[int]]): Date IDs for the predictions.
+        start_pred_date_id (Optional[int]): Start of the prediction date ID range.
+        end_pred_date_id (Optional[int]): End of the prediction date ID range.
+    """
+
+    model_ids: List[int] = Field(..., min_length=1)
+    pred_date_ids: Optional[List[int]] = Field(
+        None, min_length=1, description="Date IDs for the predictions"
+    )
+    start_pred_date_id: Optional[int] = Field(
+        None, description="Start of the prediction date ID range"
+    )
+    end_pred_date_id: Optional[int] = Field(
+        None, description="End of the prediction date ID range"
+    )
+
+    @model_validator(mode="after")
+    def check_pred_dates(self):
+        """
+        Require either a list or a complete range of prediction days.
+        """
+        has_range = (
+            self.start_pred_date_id is not None and self.end_pred_date_id is not None
+        )
+        if (self.pred_date_ids is not None) == has_range:
+            raise ValueError(
+                "Give either pred_date_ids or both start_pred_date_id and end_pred_date_id"
+            )
+        if has_range and self.start_pred_date_id > self.end_pred_date_id:
+            raise ValueError("start_pred_date_id must not be after end_pred_date_id")
+        return self
+
+
+class OrderBookRow(BaseModel):
+    """
+    Model for one order book snapshot to be scored.
+
+    Attributes:
+        stock_id (int): Identifier for the stock.
+        date_id (int): Identifier for the date.
+        seconds_in_bucket (int): Seconds since the start of the auction.
+        imbalance_size (Optional[float]): Size of the imbalance.
+        imbalance_buy_sell_flag (int): Direction of the imbalance.
+        reference_price (Optional[float]): Reference price.
+        matched_size (Optional[float]): Matched size.
+        far_price (Optional[float]): Far price.
+        near_price (Optional[float]): Near price.
+        bid_price (Optional[float]): Best bid price.
+        bid_size (Optional[float]): Best bid size.
+        ask_price (Optional[float]): Best ask price.
+        ask_size (Optional[float]): Best ask size.
+        wap (Optional[float]): Weighted average price.
+    """
+
+    stock_id: int
+    date_id: int
+    seconds_in_bucket: int
+    imbalance_size: Optional[float] = None
+    imbalance_buy_sell_flag: int
+    reference_price: Optional[float] = None
+    matched_size: Optional[float] = None
+    far_price: Optional[float] = None
+    near_price: Optional[float] = None
+    bid_price: Optional[float] = None
+    bid_size: Optional[float] = None
+    ask_price: Optional[float] = None
+    ask_size: Optional[float] = None
+    wap: Optional[float] = None
+
+
+class PredictRequest(BaseModel):
+    """
+    Model for a synchronous prediction request.
+
+    Attributes:
+        model_id (int): ID of the model to score with.
+        rows (List[OrderBookRow]): The snapshots to score.
+    """
+
+    model_id: int
+    rows: List[OrderBookRow] = Field(..., min_length=1)
+
+
+class PredictResponse(BaseModel):
+    """
+    Model for the predictions of a synchronous prediction request.
+
+    Attributes:
+        model_id (int): ID of the model used.
+        stock_id (List[int]): Stock of every row, in request order.
+        seconds_in_bucket (List[int]): Bucket of every row, in request order.
+        prediction (List[float]): Prediction of every row, in request order.
+    """
+
+    model_id: int
+    stock_id: List[int]
+    seconds_in_bucket: List[int]
+    prediction: List[float]
+
+
+class StageMetrics(BaseModel):
+    """
+    Model for the wall time and peak memory of one stage of a job.
+
+    Attributes:
+        seconds (float): Wall time of the stage, summed over its runs.
+        peak_rss_bytes (int): Highest resident memory of the worker process
+            while the stage ran.
+    """
+
+    seconds: float
+    peak_rss_bytes: int
+
+
+class JobStatus(BaseModel):
+    """
+    Model for the status of a training or inference job.
+
+    Attributes:
+        job_id (str): ID of the job.
+        kind (str): Kind of job: "train", "inference" or "batch_inference".
+        state (str): One of queued, running, succeeded, failed or cancelled.
+        submitted_at (datetime): Time the job was submitted.
+        started_at (Optional[datetime]): Time the job started running.
+        finished_at (Optional[datetime]): Time the job finished.
+        error (Optional[str]): Error message of a failed job.
+        current_stage (Optional[str]): The stage running now, if any.
+        stages (Dict[str, StageMetrics]): Metrics of every finished stage, in
+            the order the stages first ran.
+        mae (Optional[float]): Final mean absolute error, once known.
+    """
+
+    job_id: str
+    kind: str
+    state: str
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    current_stage: Optional[str] = None
+    stages: Dict[str, StageMetrics] = {}
+    mae: Optional[float] = None
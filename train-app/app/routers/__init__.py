@@ -1,3 +1,3 @@
-from . import train, inference
+from . import train, inference, predict, jobs
 
-__all__ = ["train", "inference"]
+__all__ = ["train", "inference", "predict", "jobs"]
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from app.models import InferenceRequest
-from app.services.data_operations import inference_model
+from fastapi import APIRouter, HTTPException
+from app.models import BatchInferenceRequest, InferenceRequest
+from app.services.data_operations import batch_inference_model, inference_model
+from app.services.job_executor import get_job_executor
 import logging
 
 # Configure logger
@@ -10,28 +11,57 @@ router = APIRouter()
 
 
 @router.post("/inference-model/")
-async def inference(request: InferenceRequest, background_tasks: BackgroundTasks):
+def inference(request: InferenceRequest):
     """
-    Start an inference task for the specified model in the background.
+    Queue an inference job for the specified model in the worker process pool.
 
     Args:
         request (InferenceRequest): The inference request data.
-        background_tasks (BackgroundTasks): FastAPI background tasks dependency.
 
     Returns:
-        dict: A message indicating that the inference task has started.
+        dict: A message indicating that the inference job was queued and its ID.
 
     Raises:
-        HTTPException: If there is an error starting the inference task.
+        HTTPException: If there is an error queueing the inference job.
     """
     try:
         logger.info(f"Starting inference for model {request.model_id}.")
-        # Add the inference task to be run in the background
-        background_tasks.add_task(inference_model, request)
-        logger.info(
-            f"Inference task added to background tasks for model {request.model_id}."
-        )
-        return {"message": f"Inference started for model {request.model_id}"}
+        job_id = get_job_executor().submit("inference", inference_model, request)
+        logger.info(f"Inference job {job_id} queued for model {request.model_id}.")
+        return {
+            "message": f"Inference started for model {request.model_id}",
+            "job_id": job_id,
+        }
     except Exception as e:
         logger.error(f"Error starting inference for model {request.model_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch-inference/")
+def batch_inference(request: BatchInferenceRequest):
+    """
+    Queue an inference job for several models over several days in the worker
+    process pool.
+
+    Args:
+        request (BatchInferenceRequest): The batch inference request data.
+
+    Returns:
+        dict: A message indicating that the batch inference job was queued and
+            its ID.
+
+    Raises:
+        HTTPException: If there is an error queueing the batch inference job.
+    """
+    try:
+        logger.info(f"Starting batch inference for models {request.model_ids}.")
+        job_id = get_job_executor().submit(
+            "batch_inference", batch_inference_model, request
+        )
+        return {
+            "message": f"Batch inference started for models {request.model_ids}",
+            "job_id": job_id,
+        }
+    except Exception as e:
+        logger.error(f"Error starting batch inference for models {request.model_ids}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.models import JobStatus
+from app.services.job_executor import Job, get_job_executor
+from typing import List, Optional
+import logging
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+router = APIRouter()
+
+
+def job_status(job: Job) -> dict:
+    """
+    Build the status of a job from the executor's record.
+
+    Args:
+        job (Job): The job.
+
+    Returns:
+        dict: The job status, see JobStatus.
+    """
+    return {
+        "job_id": job.job_id,
+        "kind": job.kind,
+        "state": job.state,
+        "submitted_at": job.submitted_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+        **job.metrics,
+    }
+
+
+@router.get("/jobs/", response_model=List[JobStatus])
+def read_jobs(
+    kind: Optional[str] = Query(None, description="Filter by job kind"),
+    state: Optional[str] = Query(None, description="Filter by job state"),
+):
+    """
+    List the jobs known to the executor, oldest first.
+
+    Args:
+        kind (Optional[str]): Filter by job kind.
+        state (Optional[str]): Filter by job state.
+
+    Returns:
+        List[JobStatus]: The matching jobs.
+    """
+    return [job_status(job) for job in get_job_executor().list_jobs(kind, state)]
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+def read_job(job_id: str):
+    """
+    Report the state, stage timings and MAE of a job.
+
+    Args:
+        job_id (str): ID of the job.
+
+    Returns:
+        JobStatus: The job status.
+
+    Raises:
+        HTTPException: If the job is unknown.
+    """
+    job = get_job_executor().get(job_id)
+    if job is None:
+        logger.warning(f"Job {job_id} not found.")
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job_status(job)
+
+
+@router.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """
+    Cancel a queued job.
+
+    Args:
+        job_id (str): ID of the job.
+
+    Returns:
+        dict: A message indicating that the job was cancelled.
+
+    Raises:
+        HTTPException: If the job is unknown or already running or finished.
+    """
+    try:
+        cancelled = get_job_executor().cancel(job_id)
+    except KeyError:
+        logger.warning(f"Job {job_id} not found.")
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    if not cancelled:
+        logger.warning(f"Job {job_id} is no longer queued.")
+        raise HTTPException(
+            status_code=409, detail="Only queued jobs can be cancelled."
+        )
+    return {"message": f"Job {job_id} cancelled"}
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException
+from requests.exceptions import HTTPError, RequestException
+from app.models import PredictRequest, PredictResponse
+from app.services.micro_batcher import get_micro_batcher
+from app.services.predictor import rows_to_frame
+import logging
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+router = APIRouter()
+
+
+@router.post("/predict", response_model=PredictResponse)
+async def predict(request: PredictRequest):
+    """
+    Score order book snapshots with a model and return the predictions inline.
+
+    Concurrent requests for the same model are coalesced by the micro-batcher and
+    scored with one predict call in a worker thread, so the event loop is never
+    blocked. The model comes from the in-process model cache, so only the first
+    request for a model pays for its download.
+
+    Args:
+        request (PredictRequest): The model and the snapshots to score.
+
+    Returns:
+        PredictResponse: The prediction of every row, in request order.
+
+    Raises:
+        HTTPException: 404 if the model is not found, 502 if the model registry
+            fails, 500 if the model cannot be loaded or scored.
+    """
+    df = rows_to_frame(request.rows)
+    try:
+        predictions = await get_micro_batcher().submit(request.model_id, df)
+    except IndexError as e:
+        logger.warning(f"Model {request.model_id} not found: {e}")
+        raise HTTPException(status_code=404, detail="Model not found.")
+    except HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            logger.warning(f"Model {request.model_id} not found: {e}")
+            raise HTTPException(status_code=404, detail="Model not found.")
+        logger.error(f"Model registry error for model {request.model_id}: {e}")
+        raise HTTPException(status_code=502, detail="Model registry unavailable.")
+    except RequestException as e:
+        logger.error(f"Model registry error for model {request.model_id}: {e}")
+        raise HTTPException(status_code=502, detail="Model registry unavailable.")
+    except Exception as e:
+        logger.error(f"Error scoring with model {request.model_id}: {e}")
+        raise HTTPException(status_code=500, detail="Could not score the rows.")
+
+    return {
+        "model_id": request.model_id,
+        "stock_id": df["stock_id"].tolist(),
+        "seconds_in_bucket": df["seconds_in_bucket"].tolist(),
+        "prediction": predictions.tolist(),
+    }
+
+
+@router.get("/predict/metrics")
+def predict_metrics():
+    """
+    Report the micro-batcher's batch fill and queue delay metrics.
+
+    Returns:
+        dict: Counts of batches, requests and rows, mean batch size and fill, and
+            mean and max queue delay in milliseconds.
+    """
+    return get_micro_batcher().metrics.summary()
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
 from app.models import TrainRequest
 from app.services.data_operations import train_model
+from app.services.job_executor import get_job_executor
 import logging
 
 # Configure logger
@@ -10,28 +11,27 @@ router = APIRouter()
 
 
 @router.post("/train-model/")
-async def train(request: TrainRequest, background_tasks: BackgroundTasks):
+def train(request: TrainRequest):
     """
-    Start a model training task in the background.
+    Queue a model training job in the worker process pool.
 
     Args:
         request (TrainRequest): The training request data.
-        background_tasks (BackgroundTasks): FastAPI background tasks dependency.
 
     Returns:
-        dict: A message indicating that the training task has started.
+        dict: A message indicating that the training job was queued and its ID.
 
     Raises:
-        HTTPException: If there is an error starting the training task.
+        HTTPException: If there is an error queueing the training job.
     """
     try:
         logger.info(f"Starting training for model {request.model_name}.")
-        # Add the training task to be run in the background
-        background_tasks.add_task(train_model, request)
-        logger.info(
-            f"Training task added to background tasks for model {request.model_name}."
-        )
-        return {"message": f"Training started for model {request.model_name}"}
+        job_id = get_job_executor().submit("train", train_model, request)
+        logger.info(f"Training job {job_id} queued for model {request.model_name}.")
+        return {
+            "message": f"Training started for model {request.model_name}",
+            "job_id": job_id,
+        }
     except Exception as e:
         logger.error(f"Error starting training for model {request.model_name}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
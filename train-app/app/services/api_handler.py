@@ -1,38 +1,106 @@
 import requests
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logger
 logger = logging.getLogger("optiver." + __name__)
 
 
+@lru_cache(maxsize=None)
+def get_session(pool_size=8, max_retries=3, backoff_factor=0.5):
+    """
+    Return a process-wide keep-alive session with retries, shared by all handlers.
+
+    Args:
+        pool_size (int): Number of pooled connections kept per host.
+        max_retries (int): Number of retries for failed GET requests.
+        backoff_factor (float): Exponential backoff factor between retries, in seconds.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class APIHandler:
     """
     A class to handle API requests for a given base URL with support for pagination.
 
+    Pages after the first are fetched concurrently over a shared keep-alive session.
+
     Attributes:
         base_url (str): The base URL for the API.
         page_size (int): The number of results per page for paginated requests.
+        max_workers (int): The maximum number of pages fetched concurrently.
+        session (requests.Session): The pooled session used for requests.
     """
 
-    def __init__(self, base_url, page_size=50):
+    def __init__(
+        self, base_url, page_size=50, max_workers=8, max_retries=3, backoff_factor=0.5
+    ):
         """
-        Initialize the APIHandler with a base URL and an optional page size.
+        Initialize the APIHandler with a base URL and optional pagination settings.
 
         Args:
             base_url (str): The base URL for the API.
             page_size (int): The number of results per page for paginated requests (default is 50).
+            max_workers (int): The maximum number of pages fetched concurrently (default is 8).
+            max_retries (int): Number of retries for failed GET requests (default is 3).
+            backoff_factor (float): Exponential backoff factor between retries (default is 0.5).
         """
         self.base_url = base_url
         self.page_size = page_size
+        self.max_workers = max_workers
+        self.session = get_session(max_workers, max_retries, backoff_factor)
+
+    def get_page(self, api_url, params, page):
+        """
+        Perform a GET request for a single page of a paginated API endpoint.
+
+        Args:
+            api_url (str): The API endpoint to send the GET request to.
+            params (dict): Query parameters to include in the request.
+            page (int): The page number to fetch.
+
+        Returns:
+            dict: The decoded page response.
+
+        Raises:
+            requests.exceptions.HTTPError: If an HTTP error occurs during the request.
+        """
+        url = self.base_url + api_url
+        response = self.session.get(
+            url, params={**params, "page_size": self.page_size, "page": page}
+        )
+        response.raise_for_status()  # Raise an exception for any HTTP error status codes
+        return response.json()
 
     def get(self, api_url, params):
         """
         Perform a GET request to the specified API endpoint with pagination support.
 
+        The first page gives the total number of pages; the remaining pages are
+        fetched concurrently and returned in page order.
+
         Args:
             api_url (str): The API endpoint to send the GET request to.
-            params (dict): Query parameters to include in the request.
+            params (dict): Query parameters to include in the request. Not modified.
 
         Returns:
             list: A list of all data retrieved from the paginated API endpoint.
@@ -40,23 +108,44 @@ class APIHandler:
         Raises:
             requests.exceptions.HTTPError: If an HTTP error occurs during the request.
         """
-        params["page_size"] = self.page_size
-        url = self.base_url + api_url
-        logger.info(f"API URL : {url}")
-        all_data = []
-        page = 1
-        while True:
-            params["page"] = page
-            response = requests.get(url, params=params)
-            response.raise_for_status()  # Raise an exception for any HTTP error status codes
-            data = response.json()
-            all_data.extend(data["data"])
-            if page >= data["total_pages"]:
-                break
-            page += 1
+        logger.info(f"API URL : {self.base_url + api_url}")
+        first_page = self.get_page(api_url, params, 1)
+        total_pages = first_page["total_pages"]
+
+        pages = [first_page["data"]]
+        if total_pages > 1:
+            workers = min(self.max_workers, total_pages - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages.extend(
+                    executor.map(
+                        lambda page: self.get_page(api_url, params, page)["data"],
+                        range(2, total_pages + 1),
+                    )
+                )
+
+        all_data = [item for page in pages for item in page]
         logger.info(f"Retrieved {len(all_data)} items from API.")
         return all_data
 
+    def get_item(self, api_url, params=None):
+        """
+        Perform a GET request to a non-paginated API endpoint.
+
+        Args:
+            api_url (str): The API endpoint to send the GET request to.
+            params (Optional[dict]): Query parameters to include in the request.
+
+        Returns:
+            Any: The decoded JSON response body.
+
+        Raises:
+            requests.exceptions.HTTPError: If an HTTP error occurs during the request.
+        """
+        url = self.base_url + api_url
+        response = self.session.get(url, params=params)
+        response.raise_for_status()  # Raise an exception for any HTTP error status codes
+        return response.json()
+
     def post(self, api_url, data):
         """
         Perform a POST request to the specified API endpoint.
@@ -66,7 +155,7 @@ class APIHandler:
             data (dict): The data to include in the POST request.
 
         Returns:
-            None
+            Any: The decoded JSON response body.
 
         Raises:
             Exception: If the request fails with a non-2xx status code.
@@ -74,9 +163,10 @@ class APIHandler:
         url = self.base_url + api_url
         json_data = json.dumps(data)
         headers = {"Content-Type": "application/json"}
-        response = requests.post(url, data=json_data, headers=headers)
+        response = self.session.post(url, data=json_data, headers=headers)
         if response.ok:
             logger.info("Success")
+            return response.json()
         else:
             logger.error(
                 f"Failed to ingest data: {response.status_code} - {response.text}"
@@ -0,0 +1,178 @@
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+
+class ArtifactCache:
+    """
+    A content-addressed on-disk cache of S3 objects.
+
+    Files are named after the bucket, key and ETag of the object, so a changed
+    object gets a new file and a cached file never has to be invalidated; only
+    the ETag is looked up with an S3 HEAD request.
+
+    Files are written to a temporary name and renamed into place, so readers in
+    any thread or process never see a partial file. Files are evicted
+    least-recently-used first once the cache grows beyond max_bytes; reading a
+    file refreshes its modification time. A file that is already open stays
+    readable when it is evicted.
+
+    Eviction is only serialized between the threads of one process. Job worker
+    processes evicting at the same time may remove more files than needed, and
+    a file evicted between its fetch and its open is downloaded again.
+
+    Attributes:
+        cache_dir (Path): Directory holding the cached objects.
+        max_bytes (int): Size limit of the cache directory.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Initialize the ArtifactCache.
+
+        Args:
+            cache_dir (str | Path): Directory holding the cached objects.
+            max_bytes (int): Size limit of the cache directory.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, bucket_name, s3_path, etag):
+        """
+        Return the cache file path of an object version.
+
+        The object's extension is kept so readers can still tell the format.
+
+        Args:
+            bucket_name (str): The S3 bucket.
+            s3_path (str): The S3 path of the object.
+            etag (str): The object's ETag.
+
+        Returns:
+            Path: Path of the cached file.
+        """
+        digest = hashlib.sha256(f"{bucket_name}/{s3_path}@{etag}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}{Path(s3_path).suffix}"
+
+    def fetch(self, s3_handler, s3_path):
+        """
+        Return the local path of the current version of an object, downloading
+        it only if it is not cached yet.
+
+        Open the file right away; a path that is not open may be evicted.
+
+        Args:
+            s3_handler (S3Handler): Handler of the object's bucket.
+            s3_path (str): The S3 path of the object.
+
+        Returns:
+            tuple: Path of the cached file and the object's ETag.
+        """
+        etag = s3_handler.get_etag(s3_path)
+        path = self.path(s3_handler.bucket_name, s3_path, etag)
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+            logger.info(f"{s3_path} served from the artifact cache.")
+            return path, etag
+        except FileNotFoundError:
+            pass
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # Only the version the ETag names may be stored under it
+                s3_handler.download_version(s3_path, etag, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.info(f"{s3_path} downloaded into the artifact cache.")
+        self.evict(keep=path)
+        return path, etag
+
+    def open(self, s3_handler, s3_path):
+        """
+        Open the current version of an object for reading, from the cache.
+
+        Args:
+            s3_handler (S3Handler): Handler of the object's bucket.
+            s3_path (str): The S3 path of the object.
+
+        Returns:
+            tuple: A readable binary file object and the object's ETag.
+        """
+        try:
+            path, etag = self.fetch(s3_handler, s3_path)
+            return open(path, "rb"), etag
+        except FileNotFoundError:
+            # Evicted by another reader between the fetch and the open
+            path, etag = self.fetch(s3_handler, s3_path)
+            return open(path, "rb"), etag
+
+    def get_bytes(self, s3_handler, s3_path):
+        """
+        Read the current version of an object, from the cache.
+
+        Args:
+            s3_handler (S3Handler): Handler of the object's bucket.
+            s3_path (str): The S3 path of the object.
+
+        Returns:
+            tuple: The object contents and its ETag.
+        """
+        f, etag = self.open(s3_handler, s3_path)
+        with f:
+            return f.read(), etag
+
+    def evict(self, keep=None):
+        """
+        Remove least-recently-used files until the cache fits in max_bytes.
+
+        Args:
+            keep (Optional[Path]): A file that must not be evicted, e.g. the one
+                just downloaded.
+        """
+        with self._lock:
+            files = []
+            for path in self.cache_dir.iterdir():
+                if path.suffix == ".tmp" or path == keep:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total_bytes = sum(size for _, size, _ in files)
+            if keep is not None and keep.exists():
+                total_bytes += keep.stat().st_size
+            for _, size, path in sorted(files):
+                if total_bytes <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total_bytes -= size
+                logger.info(f"Evicted {path.name} from the artifact cache.")
+
+
+@lru_cache(maxsize=None)
+def get_artifact_cache():
+    """
+    Return the process-wide S3 artifact cache configured from the environment.
+
+    Returns:
+        ArtifactCache: The shared artifact cache.
+    """
+    return ArtifactCache(
+        cache_dir=os.getenv("ARTIFACT_CACHE_DIR", "cache/artifacts"),
+        max_bytes=int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", 2 * 1024**3)),
+    )
@@ -0,0 +1,214 @@
+import os
+import logging
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+from app.services.api_handler import APIHandler
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+
+class DayCache:
+    """
+    An on-disk Parquet cache of stock data with one file per date_id.
+
+    Files are evicted least-recently-used first once the cache grows beyond
+    max_bytes; reading a day refreshes its modification time. An optional
+    validation hook decides whether a cached day is still current. It is called
+    at most once every revalidate_seconds per day and process, so hits in
+    between cost no request at all.
+
+    Attributes:
+        cache_dir (Path): Directory holding the cached days.
+        max_bytes (int): Size limit of the cache directory.
+        validate (Callable[[int, pd.DataFrame], bool]): Optional hook returning
+            False when a cached day is stale and must be fetched again.
+        revalidate_seconds (float): Interval between validations of a day.
+    """
+
+    def __init__(self, cache_dir, max_bytes, validate=None, revalidate_seconds=0):
+        """
+        Initialize the DayCache.
+
+        Args:
+            cache_dir (str | Path): Directory holding the cached days.
+            max_bytes (int): Size limit of the cache directory.
+            validate (Callable[[int, pd.DataFrame], bool]): Optional validation hook.
+            revalidate_seconds (float): Interval between validations of a day
+                (default is 0, validating on every hit).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.validate = validate
+        self.revalidate_seconds = revalidate_seconds
+        # Monotonic time each day was last validated or written by this process
+        self._validated_at = {}
+        self._lock = threading.Lock()
+
+    def path(self, date_id):
+        """
+        Return the cache file path of a day.
+
+        Args:
+            date_id (int): The date ID.
+
+        Returns:
+            Path: Path of the day's Parquet file.
+        """
+        return self.cache_dir / f"date_id={date_id}.parquet"
+
+    def get(self, date_id):
+        """
+        Read a day from the cache.
+
+        Args:
+            date_id (int): The date ID.
+
+        Returns:
+            pd.DataFrame: The cached day, or None if it is missing or stale.
+        """
+        path = self.path(date_id)
+        try:
+            # Memory-map the file instead of copying it through a read buffer
+            df = pd.read_parquet(path, memory_map=True)
+        except FileNotFoundError:
+            return None
+
+        if self.validate is not None and self._needs_validation(date_id):
+            if not self.validate(date_id, df):
+                logger.info(f"Cached date_id {date_id} is stale, dropping it.")
+                self._validated_at.pop(date_id, None)
+                path.unlink(missing_ok=True)
+                return None
+            self._validated_at[date_id] = time.monotonic()
+
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process after the read, which still succeeded
+            pass
+        return df
+
+    def _needs_validation(self, date_id):
+        validated_at = self._validated_at.get(date_id)
+        if validated_at is None:
+            return True
+        return time.monotonic() - validated_at >= self.revalidate_seconds
+
+    def put(self, date_id, df):
+        """
+        Write a day to the cache and evict old days if the cache is full.
+
+        The file is written to a temporary name and renamed into place, so
+        concurrent readers never see a partial file.
+
+        Args:
+            date_id (int): The date ID.
+            df (pd.DataFrame): The day's data.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.path(date_id))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        # Just fetched from the source, so current
+        self._validated_at[date_id] = time.monotonic()
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least-recently-used days until the cache fits in max_bytes.
+        """
+        with self._lock:
+            files = []
+            for path in self.cache_dir.glob("*.parquet"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total_bytes = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total_bytes <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total_bytes -= size
+                logger.info(f"Evicted {path.name} from the data cache.")
+
+    def read_days(self, date_ids, fetch_day):
+        """
+        Read several days, fetching and caching only the ones not cached yet.
+
+        Args:
+            date_ids (Iterable[int]): The date IDs to read.
+            fetch_day (Callable[[int], pd.DataFrame]): Fetches one day from the source.
+
+        Returns:
+            pd.DataFrame: The days concatenated in date_id order.
+        """
+        frames = []
+        missing = []
+        for date_id in sorted(set(date_ids)):
+            df = self.get(date_id)
+            if df is None:
+                missing.append(date_id)
+                df = fetch_day(date_id)
+                self.put(date_id, df)
+            frames.append(df)
+
+        logger.info(
+            f"Read {len(frames)} days, {len(frames) - len(missing)} from cache, fetched {missing}."
+        )
+        return pd.concat(frames, ignore_index=True)
+
+
+def api_row_count_validator(base_api, data_api):
+    """
+    Build a validation hook comparing a cached day's row count with the API.
+
+    The API is asked for a single-row page, which returns the day's total count.
+
+    Args:
+        base_api (str): The base URL of the data API.
+        data_api (str): The stock data endpoint.
+
+    Returns:
+        Callable[[int, pd.DataFrame], bool]: The validation hook.
+    """
+    api_handler = APIHandler(base_api, page_size=1)
+
+    def validate(date_id, df):
+        response = api_handler.get_page(data_api, {"date_id": date_id}, 1)
+        return response["total_results"] == len(df)
+
+    return validate
+
+
+@lru_cache(maxsize=None)
+def get_day_cache():
+    """
+    Return the process-wide stock data day cache configured from the environment.
+
+    Returns:
+        DayCache: The shared day cache.
+    """
+    validate = None
+    if os.getenv("DATA_CACHE_VALIDATE", "true").lower() == "true":
+        validate = api_row_count_validator(os.getenv("BASE_API"), os.getenv("DATA_API"))
+
+    return DayCache(
+        cache_dir=os.getenv("DATA_CACHE_DIR", "cache/stock_data"),
+        max_bytes=int(os.getenv("DATA_CACHE_MAX_BYTES", 2 * 1024**3)),
+        validate=validate,
+        revalidate_seconds=float(os.getenv("DATA_CACHE_REVALIDATE_SECONDS", 3600)),
+    )
@@ -1,17 +1,45 @@
+import io
 import os
 import logging
 import logging.config
 from time import time
-from pathlib import Path
-import shutil
 import pandas as pd
 import numpy as np
-import pickle
+import pyarrow as pa
+import pyarrow.parquet as pq
 import xgboost as xgb
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import TimeSeriesSplit
 from app.services.api_handler import APIHandler
-from app.services.s3_handler import S3Handler
-from app.models import TrainRequest, InferenceRequest
+from app.services.s3_handler import get_s3_handler
+from app.services.artifact_cache import get_artifact_cache
+from app.services.data_cache import get_day_cache
+from app.services.features import (
+    compute_features,
+    feature_names,
+    uses_temporal_features,
+)
+from app.services.model_artifacts import (
+    MODEL_FORMATS,
+    deserialize_model,
+    get_model_format,
+    model_format_of,
+    serialize_model,
+)
+from app.services.model_cache import get_model_cache
+from app.services.job_metrics import current_job, stage
+from app.services.workspace import JobWorkspace, job_workspace
+from app.services.external_memory import (
+    DayBatchIter,
+    external_memory_matrix,
+    load_batch,
+)
+from app.models import (
+    BatchInferenceRequest,
+    InferenceRequest,
+    TrainRequest,
+    TrainingProfile,
+)
 from dotenv import load_dotenv
 
 # Configure logger
@@ -23,17 +51,58 @@ logger = logging.getLogger("optiver." + __name__)
 # Load environment variables
 load_dotenv()
 
-
-def get_model(model_id, artifact_dir):
+# Column dtypes of stock data frames handed between pipeline stages
+STOCK_DATA_DTYPES = {
+    "stock_id": "int32",
+    "date_id": "int32",
+    "seconds_in_bucket": "int32",
+    "imbalance_size": "float64",
+    "imbalance_buy_sell_flag": "int32",
+    "reference_price": "float64",
+    "matched_size": "float64",
+    "far_price": "float64",
+    "near_price": "float64",
+    "bid_price": "float64",
+    "bid_size": "float64",
+    "ask_price": "float64",
+    "ask_size": "float64",
+    "wap": "float64",
+    "target": "float64",
+    "time_id": "int32",
+    "row_id": "string",
+    "train_type": "string",
+}
+
+# Models whose batch inference results are uploaded and ingested at once
+PUBLISH_WORKERS = int(os.getenv("BATCH_INFERENCE_PUBLISH_WORKERS", 4))
+
+# Columns kept in the inference results, key columns first
+INFERENCE_COLUMNS = [
+    "stock_id",
+    "date_id",
+    "seconds_in_bucket",
+    "time_id",
+    "target",
+    "prediction",
+]
+
+# Rows per Parquet row group of the inference results
+INFERENCE_ROW_GROUP_ROWS = int(os.getenv("INFERENCE_ROW_GROUP_ROWS", 1024))
+
+
+def get_model(model_id, workspace: JobWorkspace):
     """
-    Retrieve the base model from the S3 bucket.
+    Retrieve the base model from the S3 bucket into the job's workspace.
+
+    The artifact is read through the artifact cache, so jobs fine-tuning the
+    same base model download it only once.
 
     Args:
         model_id (int): ID of the model to retrieve.
-        artifact_dir (Path): Directory to save the downloaded model artifact.
+        workspace (JobWorkspace): Workspace to store the model artifact in.
 
     Returns:
-        Path: Path to the downloaded model artifact.
+        str: Name of the model artifact in the workspace.
     """
     base_url = os.getenv("BASE_API")
     model_api = os.getenv("MODEL_API")
@@ -43,230 +112,660 @@ def get_model(model_id, artifact_dir):
     data = api_handler.get(model_api, params)[0]
 
     model_artifact_path = data["model_artifact_path"]
-    base_model_path = S3Handler().download_file(model_artifact_path, artifact_dir)
-    return base_model_path
+    artifact, _ = get_artifact_cache().get_bytes(
+        get_s3_handler(), model_artifact_path
+    )
+    base_model_file = os.path.basename(model_artifact_path)
+    workspace.put(base_model_file, artifact)
+    return base_model_file
 
 
-def fetch_train_data(data_params, artifact_dir):
+def fetch_day(date_id):
     """
-    Fetch training data based on the provided parameters.
+    Fetch all stock data of a single day from the data API.
 
     Args:
-        data_params (TrainRequest): Parameters for fetching the training data.
-        artifact_dir (Path): Directory to save the fetched training data.
+        date_id (int): The date ID to fetch.
 
     Returns:
-        Path: Path to the saved training data CSV file.
+        pd.DataFrame: The day's stock data, all train types included.
     """
-    params = {
-        "start_date_id": data_params.start_date_id,
-        "end_date_id": data_params.end_date_id,
-        "date_id": data_params.date_id,
-    }
-
     base_api = os.getenv("BASE_API")
     data_api = os.getenv("DATA_API")
 
     api_handler = APIHandler(base_api)
-    data = api_handler.get(data_api, params)
-    data = pd.DataFrame(data)
+    data = api_handler.get(data_api, {"date_id": date_id})
+    return to_typed_frame(pd.DataFrame(data))
+
+
+def to_typed_frame(data):
+    """
+    Cast stock data to the pipeline's column dtypes.
+
+    Args:
+        data (pd.DataFrame): Stock data, e.g. decoded from JSON.
+
+    Returns:
+        pd.DataFrame: The stock data with STOCK_DATA_DTYPES applied.
+    """
+    dtypes = {
+        column: dtype
+        for column, dtype in STOCK_DATA_DTYPES.items()
+        if column in data.columns
+    }
+    return data.astype(dtypes)
+
+
+def fetch_days(date_ids):
+    """
+    Read the production stock data of several days through the local day cache.
+
+    Args:
+        date_ids (Iterable[int]): The date IDs to read.
+
+    Returns:
+        pd.DataFrame: The production rows of the requested days.
+    """
+    data = to_typed_frame(get_day_cache().read_days(date_ids, fetch_day))
     data = data[data.train_type == "prod"]
-    data.drop("train_type", axis=1, inplace=True)
+    return data.drop(columns="train_type").reset_index(drop=True)
 
-    data_path = artifact_dir / "train_data.csv"
-    data.to_csv(data_path, index=False)
-    return data_path
 
+def get_model_lineage(model_id):
+    """
+    Retrieve a model's registry record and those of the base models it was
+    fine-tuned from.
+
+    Args:
+        model_id (int): ID of the model.
 
-def fetch_inference_data(data_params, artifact_dir):
+    Returns:
+        list: The registry records, the model first and its first ancestor last.
+    """
+    api_handler = APIHandler(base_url=os.getenv("BASE_API"))
+    return api_handler.get_item(f"{os.getenv('MODEL_API')}{model_id}/lineage")
+
+
+def get_train_date_ids(data_params, seen_through):
+    """
+    Resolve the days of a training request, leaving out those the base model
+    was already trained on.
+
+    Requested days up to seen_through are dropped. A request with an
+    end_date_id but no start_date_id covers every day after seen_through, one
+    without an end_date_id only its date_id, as TrainRequest requires. The
+    validation_days last days up to seen_through are returned separately, to
+    evaluate on only; earlier trainings fetched them, so they are read from the
+    day cache.
+
+    Args:
+        data_params (TrainRequest): The training request.
+        seen_through (int): Last date ID the base model's lineage was trained on.
+
+    Returns:
+        tuple: The new date IDs to train on and the validation date IDs, both
+            in order.
+
+    Raises:
+        ValueError: If the base model was already trained on every requested day.
+    """
+    if data_params.start_date_id is not None and data_params.end_date_id is not None:
+        requested = range(data_params.start_date_id, data_params.end_date_id + 1)
+    elif data_params.end_date_id is not None:
+        requested = range(seen_through + 1, data_params.end_date_id + 1)
+    else:
+        requested = [data_params.date_id]
+
+    new_date_ids = [date_id for date_id in requested if date_id > seen_through]
+    if not new_date_ids:
+        raise ValueError(
+            f"Base model {data_params.model_id} was already trained on every "
+            f"requested day, up to date_id {seen_through}."
+        )
+
+    first_validation_day = max(seen_through - data_params.validation_days + 1, 0)
+    validation_date_ids = list(range(first_validation_day, seen_through + 1))
+    return new_date_ids, validation_date_ids
+
+
+def fetch_inference_data(data_params):
     """
     Fetch inference data based on the provided parameters.
 
     Args:
         data_params (InferenceRequest): Parameters for fetching the inference data.
-        artifact_dir (Path): Directory to save the fetched inference data.
 
     Returns:
-        Path: Path to the saved inference data CSV file.
+        pd.DataFrame: The typed inference data.
     """
-    assert data_params.pred_date_id > 1
-    logger.info(f"Prediction Date ID: {data_params.pred_date_id}")
-    logger.info(f"Fetching Data for {data_params.pred_date_id - 1} DateID")
+    return fetch_pred_day(data_params.pred_date_id)
 
-    params = {"date_id": data_params.pred_date_id - 1}
 
-    base_api = os.getenv("BASE_API")
-    data_api = os.getenv("DATA_API")
+def fetch_pred_day(pred_date_id):
+    """
+    Fetch the data a prediction day is scored on, that of the day before it.
 
-    api_handler = APIHandler(base_api)
-    data = api_handler.get(data_api, params)
-    data = pd.DataFrame(data)
-    data = data[data.train_type == "prod"]
-    data.drop("train_type", axis=1, inplace=True)
+    Args:
+        pred_date_id (int): Date ID for the prediction.
+
+    Returns:
+        pd.DataFrame: The typed inference data.
+    """
+    assert pred_date_id > 1
+    logger.info(f"Prediction Date ID: {pred_date_id}")
+    logger.info(f"Fetching Data for {pred_date_id - 1} DateID")
 
-    data_path = artifact_dir / "inference_data.csv"
-    data.to_csv(data_path, index=False)
-    return data_path
+    return fetch_days([pred_date_id - 1])
 
 
-def generate_features(df):
+def get_pred_date_ids(request: BatchInferenceRequest):
     """
-    Generate additional features for the dataset.
+    Resolve the prediction date IDs covered by a batch inference request.
 
     Args:
-        df (pd.DataFrame): Dataframe containing the original data.
+        request (BatchInferenceRequest): The batch inference request.
 
     Returns:
-        tuple: Updated dataframe with additional features and the list of feature names.
-    """
-    features = [
-        "seconds_in_bucket",
-        "imbalance_buy_sell_flag",
-        "imbalance_size",
-        "matched_size",
-        "bid_size",
-        "ask_size",
-        "reference_price",
-        "far_price",
-        "near_price",
-        "ask_price",
-        "bid_price",
-        "wap",
-        "imb_s1",
-        "imb_s2",
-    ]
+        list: The prediction date IDs, without duplicates, in request order.
+    """
+    if request.pred_date_ids is not None:
+        return list(dict.fromkeys(request.pred_date_ids))
+    return list(range(request.start_pred_date_id, request.end_pred_date_id + 1))
 
-    df = df.copy()
 
-    df["imb_s1"] = (df["bid_size"] - df["ask_size"]) / (df["bid_size"] + df["ask_size"])
-    df["imb_s2"] = (df["imbalance_size"] - df["matched_size"]) / (
-        df["matched_size"] + df["imbalance_size"]
+def training_params(profile, nthread):
+    """
+    Build the XGBoost parameters of a training profile.
+
+    Args:
+        profile (TrainingProfile): The training options.
+        nthread (int): Number of threads.
+
+    Returns:
+        dict: The XGBoost parameters.
+    """
+    return {
+        "objective": "reg:squarederror",
+        "eval_metric": "mae",
+        "learning_rate": profile.learning_rate,
+        "tree_method": profile.tree_method,
+        "max_bin": profile.max_bin,
+        "nthread": nthread,
+    }
+
+
+def train_fold(
+    fold, X, y, train_end, test_end, reference, initial_model, profile, nthread
+):
+    """
+    Train and evaluate the model on one time-series cross-validation fold.
+
+    The fold trains on rows [0, train_end) and is evaluated on rows
+    [train_end, test_end). Both matrices are quantized with the cuts of the
+    reference matrix instead of sketching the data again.
+
+    Args:
+        fold (int): Index of the fold, for logging.
+        X (np.ndarray): The feature matrix.
+        y (np.ndarray): The target vector.
+        train_end (int): End of the training rows.
+        test_end (int): End of the evaluation rows.
+        reference (xgb.QuantileDMatrix): Matrix holding the shared quantile cuts.
+        initial_model (bytearray): The serialized base model.
+        profile (TrainingProfile): The training options.
+        nthread (int): Number of threads for this fold.
+
+    Returns:
+        tuple: The trained model and the fold's wall time in seconds.
+    """
+    start = time()
+    dtrain = xgb.QuantileDMatrix(
+        X[:train_end],
+        label=y[:train_end],
+        ref=reference,
+        max_bin=profile.max_bin,
+        nthread=nthread,
+    )
+    dtest = xgb.QuantileDMatrix(
+        X[train_end:test_end],
+        label=y[train_end:test_end],
+        ref=dtrain,
+        max_bin=profile.max_bin,
+        nthread=nthread,
+    )
+    model_xgb = xgb.train(
+        training_params(profile, nthread),
+        dtrain,
+        num_boost_round=profile.num_boost_round,
+        evals=[(dtest, "eval")],
+        early_stopping_rounds=profile.early_stopping_rounds,
+        verbose_eval=False,
+        xgb_model=initial_model,
+    )
+    seconds = time() - start
+    logger.info(
+        f"Fold {fold}: {train_end} train rows, {test_end - train_end} eval rows, "
+        f"MAE {model_xgb.best_score}, {seconds:.2f}s"
     )
+    return model_xgb, seconds
+
+
+def cross_validate(X, y, initial_model, profile):
+    """
+    Train the time-series cross-validation folds of a training profile.
 
-    prices = [
-        "reference_price",
-        "far_price",
-        "near_price",
-        "ask_price",
-        "bid_price",
-        "wap",
+    The folds are trained concurrently, with the job's threads split between
+    them. XGBoost releases the GIL while building matrices and training, so the
+    folds share one copy of the data and of the quantile cuts in threads.
+
+    Args:
+        X (np.ndarray): The feature matrix.
+        y (np.ndarray): The target vector.
+        initial_model (bytearray): The serialized base model.
+        profile (TrainingProfile): The training options.
+
+    Returns:
+        list: The model and wall time in seconds of every fold, in fold order.
+    """
+    # Folds train on growing prefixes of the rows and evaluate on the next block
+    tscv = TimeSeriesSplit(n_splits=profile.n_splits)
+    folds = [
+        (train_index[-1] + 1, test_index[-1] + 1)
+        for train_index, test_index in tscv.split(X)
     ]
-    for i, a in enumerate(prices):
-        for j, b in enumerate(prices[i + 1 :], i + 1):
-            df[f"{a}_{b}_diff"] = df[a] - df[b]
-            features.append(f"{a}_{b}_diff")
-    return df, features
 
+    num_threads = profile.nthread or os.cpu_count() or 1
+    workers = min(len(folds), num_threads)
+    nthread = max(1, num_threads // workers)
+
+    start = time()
+    reference = xgb.QuantileDMatrix(
+        X, label=y, max_bin=profile.max_bin, nthread=num_threads
+    )
+    logger.info(f"Quantile cuts built in {time() - start:.2f}s")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                train_fold,
+                fold,
+                X,
+                y,
+                train_end,
+                test_end,
+                reference,
+                initial_model,
+                profile,
+                nthread,
+            )
+            for fold, (train_end, test_end) in enumerate(folds)
+        ]
+        results = [future.result() for future in futures]
+
+    logger.info(
+        f"Trained {len(folds)} folds on {workers} workers x {nthread} threads "
+        f"in {time() - start:.2f}s, fold times {[round(s, 2) for _, s in results]}"
+    )
+    return results
+
+
+def refit(X, y, initial_model, profile, num_boost_round, X_valid=None, y_valid=None):
+    """
+    Train the final model on every row of the training window.
 
-def incremental_training(data_path, base_model_path, artifact_dir, model_name):
+    Args:
+        X (np.ndarray): The feature matrix.
+        y (np.ndarray): The target vector.
+        initial_model (bytearray): The serialized base model.
+        profile (TrainingProfile): The training options.
+        num_boost_round (int): Boosting rounds to add to the base model.
+        X_valid (Optional[np.ndarray]): Features of the validation days; if
+            given, training stops early on them.
+        y_valid (Optional[np.ndarray]): Target of the validation days.
+
+    Returns:
+        xgb.Booster: The trained model.
+    """
+    nthread = profile.nthread or os.cpu_count() or 1
+    dtrain = xgb.QuantileDMatrix(X, label=y, max_bin=profile.max_bin, nthread=nthread)
+    evals, early_stopping_rounds = [], None
+    if X_valid is not None:
+        dvalid = xgb.QuantileDMatrix(
+            X_valid, label=y_valid, ref=dtrain, max_bin=profile.max_bin, nthread=nthread
+        )
+        evals, early_stopping_rounds = [(dvalid, "eval")], profile.early_stopping_rounds
+
+    model_xgb = xgb.train(
+        training_params(profile, nthread),
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=evals,
+        early_stopping_rounds=early_stopping_rounds,
+        verbose_eval=False,
+        xgb_model=initial_model,
+    )
+    logger.info(f"Final model trained on all {len(y)} rows.")
+    return model_xgb
+
+
+def incremental_training(
+    df_train,
+    base_model_file,
+    workspace,
+    model_name,
+    temporal=False,
+    profile: TrainingProfile = None,
+    df_valid=None,
+):
     """
     Perform incremental training on the provided data.
 
+    The cross-validation folds measure the MAE; the uploaded model is then
+    trained on every row, so it has seen every day of df_train. Without
+    validation data it adds the rounds the last fold stopped at, otherwise it
+    stops early on the validation data.
+
     Args:
-        data_path (Path): Path to the training data CSV file.
-        base_model_path (Path): Path to the base model artifact.
-        artifact_dir (Path): Directory to save the trained model.
+        df_train (pd.DataFrame): The typed training data.
+        base_model_file (str): Name of the base model artifact in the workspace.
+        workspace (JobWorkspace): The job's workspace.
         model_name (str): Name of the model.
+        temporal (bool): Whether to train with the temporal features.
+        profile (TrainingProfile): Training options (default profile if not set).
+        df_valid (Optional[pd.DataFrame]): Typed data to evaluate the final
+            model on, never trained on.
 
     Returns:
-        str: Path to the uploaded model artifact in the S3 bucket.
+        tuple: Path to the uploaded model artifact in the S3 bucket and the last
+            date ID the model was trained on.
+    """
+    profile = profile or TrainingProfile()
+    base_model = deserialize_model(workspace.read(base_model_file))
+    # Serialized once; every fold loads its own copy of the base model from it
+    initial_model = base_model.save_raw()
+
+    with stage("features"):
+        X, y = load_batch(df_train, temporal)
+        X_valid = y_valid = None
+        if df_valid is not None and len(df_valid):
+            X_valid, y_valid = load_batch(df_valid, temporal)
+    with stage("train"):
+        results = cross_validate(X, y, initial_model, profile)
+        # Rounds the last fold kept, on top of those of the base model
+        num_boost_round = (
+            results[-1][0].best_iteration + 1 - base_model.num_boosted_rounds()
+        )
+        if X_valid is not None:
+            num_boost_round = profile.num_boost_round
+        model_xgb = refit(
+            X, y, initial_model, profile, max(num_boost_round, 1), X_valid, y_valid
+        )
+
+    xgboost_models = [model for model, _ in results]
+    average_mae = np.mean([model.best_score for model in xgboost_models])
+    logger.info(f"Average MAE across all folds: {average_mae}")
+    current_job().set_mae(average_mae)
+
+    with stage("upload"):
+        s3_path = upload_model(model_xgb, workspace, model_name)
+    return s3_path, int(df_train["date_id"].max())
+
+
+def external_memory_training(
+    date_ids,
+    base_model_file,
+    workspace,
+    model_name,
+    temporal=False,
+    profile: TrainingProfile = None,
+    validation_date_ids=None,
+):
     """
-    df_train = pd.read_csv(data_path)
-    initial_model = pickle.load(open(base_model_path, "rb"))
+    Perform incremental training streaming the data from the day cache.
+
+    The training days are streamed in batches through XGBoost's external
+    memory, so memory use is bounded by the batch size rather than by the
+    training window. Training stops early on the validation days; without them
+    the last day is held out for it instead, and not trained on.
+
+    Args:
+        date_ids (List[int]): The date IDs to train on, in order.
+        base_model_file (str): Name of the base model artifact in the workspace.
+        workspace (JobWorkspace): The job's workspace; XGBoost's cache files go
+            to its spill directory.
+        model_name (str): Name of the model.
+        temporal (bool): Whether to train with the temporal features.
+        profile (TrainingProfile): Training options (default profile if not set);
+            n_splits does not apply.
+        validation_date_ids (Optional[List[int]]): The date IDs to evaluate on.
 
-    df_train = df_train.dropna(subset=["target"]).copy()
-    df_train, _ = generate_features(df_train)
-    feature_names = df_train.drop(
-        columns=["target", "date_id", "stock_id"]
-    ).columns.tolist()
+    Returns:
+        tuple: Path to the uploaded model artifact in the S3 bucket and the last
+            date ID the model was trained on.
 
-    X = df_train[feature_names].values
-    y = df_train["target"].values
+    Raises:
+        ValueError: If fewer than two days are given without validation days.
+    """
+    if validation_date_ids:
+        train_date_ids, eval_date_ids = date_ids, validation_date_ids
+    elif len(date_ids) < 2:
+        raise ValueError(
+            "External memory training needs at least two days or validation days."
+        )
+    else:
+        train_date_ids, eval_date_ids = date_ids[:-1], date_ids[-1:]
 
-    xgboost_models = []
-    xgboost_cv_errors = []
-    tscv = TimeSeriesSplit(n_splits=5)
+    profile = profile or TrainingProfile()
+    initial_model = deserialize_model(workspace.read(base_model_file))
 
-    for train_index, test_index in tscv.split(X):
-        X_train_cv, X_test_cv = X[train_index], X[test_index]
-        y_train_cv, y_test_cv = y[train_index], y[test_index]
+    train_iter = DayBatchIter(
+        train_date_ids,
+        fetch_days,
+        cache_prefix=str(workspace.dir / "xgb_cache"),
+        temporal=temporal,
+    )
+    # Days are fetched while the matrix is built, so both count as features
+    with stage("features"):
+        dtrain = external_memory_matrix(train_iter, max_bin=profile.max_bin)
+        X_eval, y_eval = load_batch(fetch_days(eval_date_ids), temporal)
+        deval = xgb.DMatrix(X_eval, label=y_eval)
 
-        dtrain = xgb.DMatrix(X_train_cv, label=y_train_cv)
-        dtest = xgb.DMatrix(X_test_cv, label=y_test_cv)
-        params = {
-            "objective": "reg:squarederror",
-            "eval_metric": "mae",
-            "learning_rate": 0.01,
-        }
+    with stage("train"):
         model_xgb = xgb.train(
-            params,
+            training_params(profile, profile.nthread or os.cpu_count() or 1),
             dtrain,
-            num_boost_round=50,
-            evals=[(dtest, "eval")],
-            early_stopping_rounds=30,
+            num_boost_round=profile.num_boost_round,
+            evals=[(deval, "eval")],
+            early_stopping_rounds=profile.early_stopping_rounds,
             verbose_eval=False,
             xgb_model=initial_model,
         )
-        xgboost_models.append(model_xgb)
-        xgboost_cv_errors.append(model_xgb.best_score)
+    logger.info(f"MAE on held-out date_ids {eval_date_ids}: {model_xgb.best_score}")
+    current_job().set_mae(model_xgb.best_score)
+
+    with stage("upload"):
+        s3_path = upload_model(model_xgb, workspace, model_name)
+    return s3_path, train_date_ids[-1]
 
-    average_mae = np.mean(xgboost_cv_errors)
-    logger.info(f"Average MAE across all folds: {average_mae}")
 
-    model_filename = f"{model_name}.pickle"
-    with open(artifact_dir / model_filename, "wb") as f:
-        pickle.dump(xgboost_models[-1], f)
+def upload_model(model, workspace, model_name):
+    """
+    Save a trained model in the configured artifact format and upload it to the
+    S3 bucket.
+
+    Args:
+        model (xgb.Booster): The trained model.
+        workspace (JobWorkspace): The job's workspace.
+        model_name (str): Name of the model.
+
+    Returns:
+        str: Path to the uploaded model artifact in the S3 bucket.
+    """
+    model_format = get_model_format()
+    model_filename = f"{model_name}{MODEL_FORMATS[model_format]}"
+    workspace.put(model_filename, serialize_model(model, model_format))
 
     s3_path = f"trained_models/{model_filename}"
-    s3_client = S3Handler()
-    s3_client.upload_file(artifact_dir / model_filename, s3_path)
+    with workspace.open(model_filename) as f:
+        get_s3_handler().upload_fileobj(f, s3_path)
     return s3_path
 
 
-def run_inference(model_path, data_path, artifact_dir, request: InferenceRequest):
+def score_models(models, infer_df):
     """
-    Run inference using the provided model and data.
+    Score the rows with a known target with several models on one feature matrix.
+
+    Features are computed once, with the temporal features if any model uses
+    them. Models trained without them are scored on the leading snapshot columns,
+    which the temporal layout shares.
 
     Args:
-        model_path (Path): Path to the model artifact.
-        data_path (Path): Path to the inference data CSV file.
-        artifact_dir (Path): Directory to save the inference results.
-        request (InferenceRequest): The inference request data.
+        models (dict): The models (xgb.Booster) keyed by model ID.
+        infer_df (pd.DataFrame): The typed inference data.
 
     Returns:
-        str: Path to the uploaded inference results in the S3 bucket.
+        tuple: The scored rows of infer_df and a dict with the predictions of
+            every model, keyed by model ID.
     """
-    with open(model_path, "rb") as f:
-        model = pickle.load(f)
+    # Models trained with the temporal features have more inputs
+    temporal = any(
+        uses_temporal_features(model.num_features()) for model in models.values()
+    )
+    with stage("features"):
+        X_inference, _ = compute_features(infer_df, temporal=temporal)
+        has_target = infer_df["target"].notna().to_numpy()
+        X_inference = X_inference[has_target]
+    num_snapshot_features = len(feature_names(temporal=False))
+
+    predictions = {}
+    with stage("predict"):
+        for model_id, model in models.items():
+            if uses_temporal_features(model.num_features()):
+                predictions[model_id] = model.inplace_predict(X_inference)
+            else:
+                predictions[model_id] = model.inplace_predict(
+                    X_inference[:, :num_snapshot_features]
+                )
+    return infer_df[has_target].reset_index(drop=True), predictions
+
+
+def inference_to_parquet(predictions_df) -> bytes:
+    """
+    Serialize inference results as zstd-compressed Parquet.
 
-    infer_df = pd.read_csv(data_path)
-    infer_df = infer_df.dropna(subset=["target"]).copy()
-    infer_df, feature_names = generate_features(infer_df)
+    Only the key columns, the target and the prediction are kept. Rows are sorted
+    by stock_id and seconds_in_bucket, so every row group covers a narrow stock_id
+    range and readers filtering on one stock skip the other row groups by their
+    statistics.
 
-    X_inference = infer_df[feature_names].values
+    Args:
+        predictions_df (pd.DataFrame): The inference data with a prediction column.
+
+    Returns:
+        bytes: The Parquet file.
+    """
+    columns = [column for column in INFERENCE_COLUMNS if column in predictions_df]
+    df = predictions_df[columns].sort_values(["stock_id", "seconds_in_bucket"])
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    buffer = io.BytesIO()
+    pq.write_table(
+        table,
+        buffer,
+        compression="zstd",
+        row_group_size=INFERENCE_ROW_GROUP_ROWS,
+        sorting_columns=[
+            pq.SortingColumn(columns.index("stock_id")),
+            pq.SortingColumn(columns.index("seconds_in_bucket")),
+        ],
+    )
+    return buffer.getvalue()
 
-    d_inference = xgb.DMatrix(X_inference)
-    predictions = model.predict(d_inference)
 
-    infer_df["prediction"] = predictions
+def upload_inference(predictions_df, workspace, model_id, pred_date_id):
+    """
+    Save the inference results of one model and day as Parquet and upload them
+    to S3.
+
+    Args:
+        predictions_df (pd.DataFrame): The inference data with a prediction column.
+        workspace (JobWorkspace): The job's workspace.
+        model_id (int): ID of the model used for inference.
+        pred_date_id (int): Date ID for the prediction.
 
-    inference_filename = f"inference_{request.model_id}_{request.pred_date_id}.csv"
-    infer_df.to_csv(artifact_dir / inference_filename, index=False)
+    Returns:
+        str: Path to the uploaded inference results in the S3 bucket.
+    """
+    inference_filename = f"inference_{model_id}_{pred_date_id}.parquet"
+    workspace.put(inference_filename, inference_to_parquet(predictions_df))
 
     s3_path = f"inference_data/{inference_filename}"
-    s3_client = S3Handler()
-    s3_client.upload_file(artifact_dir / inference_filename, s3_path)
+    with workspace.open(inference_filename) as f:
+        get_s3_handler().upload_fileobj(f, s3_path)
+    # Uploaded results are not needed again, free them for the next ones
+    workspace.remove(inference_filename)
     return s3_path
 
 
-def ingest_model(model_name, date_id, model_artifact_path):
+def run_inference(model, infer_df, workspace, request: InferenceRequest):
+    """
+    Run inference using the provided model and data.
+
+    Args:
+        model (xgb.Booster): The model.
+        infer_df (pd.DataFrame): The typed inference data.
+        workspace (JobWorkspace): The job's workspace.
+        request (InferenceRequest): The inference request data.
+
+    Returns:
+        tuple: Path to the uploaded inference results in the S3 bucket and the
+            dataframe with the prediction of each row.
+    """
+    infer_df, predictions = score_models({request.model_id: model}, infer_df)
+    infer_df["prediction"] = predictions[request.model_id]
+    mae = (infer_df["prediction"] - infer_df["target"]).abs().mean()
+    logger.info(f"MAE of model {request.model_id}: {mae}")
+    current_job().set_mae(mae)
+
+    with stage("upload"):
+        s3_path = upload_inference(
+            infer_df, workspace, request.model_id, request.pred_date_id
+        )
+    return s3_path, infer_df
+
+
+def publish_inference(predictions_df, workspace, model_id, pred_date_id):
+    """
+    Upload the inference results of one model and day and register them.
+
+    Args:
+        predictions_df (pd.DataFrame): The inference data with a prediction column.
+        workspace (JobWorkspace): The job's workspace.
+        model_id (int): ID of the model used for inference.
+        pred_date_id (int): Date ID for the prediction.
+    """
+    predictions_path = upload_inference(
+        predictions_df, workspace, model_id, pred_date_id
+    )
+    ingest_inference(pred_date_id, model_id, predictions_path)
+    ingest_predictions(pred_date_id, model_id, predictions_df)
+    logger.info(
+        f"Predictions of model {model_id} for date_id {pred_date_id} published."
+    )
+
+
+def ingest_model(model_name, date_id, model_artifact_path, parent_model_id=None):
     """
     Ingest the trained model information into the database.
 
     Args:
         model_name (str): Name of the model.
-        date_id (int): ID of the date the model was trained.
+        date_id (int): ID of the last date the model was trained on.
         model_artifact_path (str): Path to the model artifact in the S3 bucket.
+        parent_model_id (Optional[int]): ID of the base model it was fine-tuned from.
+
+    Returns:
+        int: ID of the registered model.
     """
     try:
         base_api = os.getenv("BASE_API")
@@ -278,9 +777,11 @@ def ingest_model(model_name, date_id, model_artifact_path):
         data = {
             "model_name": model_name,
             "model_artifact_path": model_artifact_path,
+            "model_format": model_format_of(model_artifact_path),
             "date_id": date_id,
+            "parent_model_id": parent_model_id,
         }
-        api_handler.post(model_api, data)
+        return api_handler.post(model_api, data)["model_id"]
     except Exception as e:
         logger.error(f"Failed to ingest model: {e}")
         raise
@@ -313,65 +814,240 @@ def ingest_inference(date_id, model_id, prediction_path):
         raise
 
 
-async def train_model(request: TrainRequest):
+def ingest_predictions(date_id, model_id, predictions_df):
     """
-    Perform the training process for the specified model.
+    Load the per-row predictions into the database in bulk.
 
     Args:
-        request (TrainRequest): The training request data.
+        date_id (int): ID of the date the inference was made.
+        model_id (int): ID of the model used for inference.
+        predictions_df (pd.DataFrame): Dataframe with stock_id, seconds_in_bucket,
+            target and prediction columns.
     """
-    artifact_dir = Path(os.getcwd()) / f"artifacts/{int(time())}"
-    os.makedirs(artifact_dir, exist_ok=True)
-    logger.info("Setting Artifact Directory to artifact dir")
+    try:
+        base_api = os.getenv("BASE_API")
+        predictions_api = os.getenv("PREDICTIONS_API")
+        if not base_api or not predictions_api:
+            raise EnvironmentError("API environment variables are not set properly.")
 
-    base_model_path = get_model(request.model_id, artifact_dir)
-    logger.info("Base Model Path %s", base_model_path)
+        api_handler = APIHandler(base_api)
+        # Columns are sent as lists, which keeps the payload compact
+        data = {
+            "model_id": model_id,
+            "date_id": date_id,
+            "stock_id": predictions_df["stock_id"].astype(int).tolist(),
+            "seconds_in_bucket": predictions_df["seconds_in_bucket"]
+            .astype(int)
+            .tolist(),
+            "prediction": predictions_df["prediction"].astype(float).tolist(),
+            "target": predictions_df["target"].astype(float).tolist(),
+        }
+        api_handler.post(predictions_api, data)
+    except Exception as e:
+        logger.error(f"Failed to ingest predictions: {e}")
+        raise
 
-    train_data_path = fetch_train_data(request, artifact_dir)
-    logger.info("Train Data Path %s", train_data_path)
 
-    uploaded_path = incremental_training(
-        train_data_path, base_model_path, artifact_dir, request.model_name
-    )
+def ingest_training_session(model_id, date_id, metrics):
+    """
+    Record the stage timings and MAE of a training job in the database.
+
+    Args:
+        model_id (int): ID of the trained model.
+        date_id (int): ID of the date the model was trained.
+        metrics (dict): The job's metrics, see JobMetrics.summary.
+    """
+    try:
+        base_api = os.getenv("BASE_API")
+        training_session_api = os.getenv("TRAINING_SESSION_API")
+        if not base_api or not training_session_api:
+            raise EnvironmentError("API environment variables are not set properly.")
+
+        api_handler = APIHandler(base_api)
+        data = {
+            "model_id": model_id,
+            "date_id": date_id,
+            "stage_timings": metrics["stages"],
+            "average_mae": metrics["mae"],
+        }
+        api_handler.post(training_session_api, data)
+    except Exception as e:
+        logger.error(f"Failed to ingest training session: {e}")
+        raise
+
+
+def train_model(request: TrainRequest):
+    """
+    Perform the training process for the specified model.
+
+    Only the days the base model's lineage was not trained on yet are trained
+    on as new data, see get_train_date_ids.
+
+    Intermediate files live in a private workspace of the job, removed when the
+    job ends.
+
+    Args:
+        request (TrainRequest): The training request data.
+    """
+    with job_workspace() as workspace:
+        logger.info("Using workspace %s", workspace.workspace_id)
+
+        with stage("get_model"):
+            base_model_file = get_model(request.model_id, workspace)
+            lineage = get_model_lineage(request.model_id)
+        logger.info("Base Model %s", base_model_file)
+
+        # A model's date_id is the last day it was trained on
+        seen_through = max(record["date_id"] for record in lineage)
+        date_ids, validation_date_ids = get_train_date_ids(request, seen_through)
+        cached = sum(
+            get_day_cache().path(date_id).exists()
+            for date_id in date_ids + validation_date_ids
+        )
+        logger.info(
+            f"Base model lineage of {len(lineage)} models saw days up to "
+            f"{seen_through}; training on {len(date_ids)} new days, validating on "
+            f"{len(validation_date_ids)} seen days, {cached} days cached."
+        )
+
+        if request.training_mode == "external_memory":
+            uploaded_path, trained_through = external_memory_training(
+                date_ids,
+                base_model_file,
+                workspace,
+                request.model_name,
+                temporal=request.temporal_features,
+                profile=request.profile,
+                validation_date_ids=validation_date_ids,
+            )
+        else:
+            with stage("fetch_data"):
+                train_data = fetch_days(date_ids)
+                valid_data = None
+                if validation_date_ids:
+                    valid_data = fetch_days(validation_date_ids)
+            logger.info("Train Data Rows %s", len(train_data))
+
+            uploaded_path, trained_through = incremental_training(
+                train_data,
+                base_model_file,
+                workspace,
+                request.model_name,
+                temporal=request.temporal_features,
+                profile=request.profile,
+                df_valid=valid_data,
+            )
     logger.info("Model Uploaded to %s", uploaded_path)
 
-    ingest_model(request.model_name, request.date_id, uploaded_path)
+    with stage("ingest"):
+        # Days held out for early stopping stay unseen for the next retrain
+        model_id = ingest_model(
+            request.model_name,
+            trained_through,
+            uploaded_path,
+            parent_model_id=request.model_id,
+        )
     logger.info("Model Ingest Successfully")
 
-    logger.info(f"Congratulations!! Training completed for model {request.model_name}")
-
     try:
-        shutil.rmtree(artifact_dir)
-    except Exception as e:
-        logger.error("Error cleaning up artifacts: %s", str(e))
+        ingest_training_session(model_id, trained_through, current_job().summary())
+    except Exception:
+        # The model is registered, so missing timings do not fail the job
+        logger.warning("Stage timings of model %s not recorded", request.model_name)
+
+    logger.info(f"Congratulations!! Training completed for model {request.model_name}")
 
 
-async def inference_model(request: InferenceRequest):
+def inference_model(request: InferenceRequest):
     """
     Perform the inference process for the specified model.
 
     Args:
         request (InferenceRequest): The inference request data.
     """
-    artifact_dir = Path(os.getcwd()) / f"artifacts/{int(time())}"
-    os.makedirs(artifact_dir, exist_ok=True)
-    logger.info("Setting Artifact Directory to artifact dir")
+    # Served from memory when the same model was used before
+    with stage("get_model"):
+        model = get_model_cache().get(request.model_id)
+    logger.info("Model %s loaded", request.model_id)
+
+    with stage("fetch_data"):
+        inference_data = fetch_inference_data(request)
+    logger.info("Inference Data Rows %s", len(inference_data))
+
+    with job_workspace() as workspace:
+        predictions_path, predictions_df = run_inference(
+            model, inference_data, workspace, request
+        )
+    logger.info("Predictions Uploaded to %s", predictions_path)
 
-    model_path = get_model(request.model_id, artifact_dir)
-    logger.info("Model Path %s", model_path)
+    with stage("ingest"):
+        ingest_inference(request.pred_date_id, request.model_id, predictions_path)
+        logger.info("Inference Ingestion Success!!")
 
-    inference_data_path = fetch_inference_data(request, artifact_dir)
-    logger.info("Inference Data Path %s", inference_data_path)
+        ingest_predictions(request.pred_date_id, request.model_id, predictions_df)
+        logger.info("Predictions Ingestion Success!!")
 
-    predictions_path = run_inference(
-        model_path, inference_data_path, artifact_dir, request
-    )
-    logger.info("Predictions Uploaded to %s", predictions_path)
 
-    ingest_inference(request.pred_date_id, request.model_id, predictions_path)
-    logger.info("Inference Ingestion Success!!")
+def batch_inference_model(request: BatchInferenceRequest):
+    """
+    Perform inference for several models over several days.
 
-    try:
-        shutil.rmtree(artifact_dir)
-    except Exception as e:
-        logger.error("Error cleaning up artifacts: %s", str(e))
+    Each day is fetched and featurized once and scored by every model. The next
+    day is fetched while the current one is scored, and the results of all models
+    are uploaded and ingested concurrently. A failure to publish one model's
+    results does not stop the others.
+
+    Args:
+        request (BatchInferenceRequest): The batch inference request data.
+
+    Raises:
+        RuntimeError: If the results of any model and day could not be published.
+    """
+    # Served from memory when the same models were used before
+    with stage("get_model"):
+        models = {
+            model_id: get_model_cache().get(model_id) for model_id in request.model_ids
+        }
+    logger.info("Models %s loaded", list(models))
+
+    pred_date_ids = get_pred_date_ids(request)
+    failures = []
+    with job_workspace() as workspace, ThreadPoolExecutor(
+        max_workers=1
+    ) as prefetcher, ThreadPoolExecutor(max_workers=PUBLISH_WORKERS) as publisher:
+        next_day = prefetcher.submit(fetch_pred_day, pred_date_ids[0])
+        for i, pred_date_id in enumerate(pred_date_ids):
+            # Only the time spent waiting for the prefetched day counts
+            with stage("fetch_data"):
+                inference_data = next_day.result()
+            if i + 1 < len(pred_date_ids):
+                next_day = prefetcher.submit(fetch_pred_day, pred_date_ids[i + 1])
+            logger.info("Inference Data Rows %s", len(inference_data))
+
+            scored_df, predictions = score_models(models, inference_data)
+            published = {
+                publisher.submit(
+                    publish_inference,
+                    scored_df.assign(prediction=predictions[model_id]),
+                    workspace,
+                    model_id,
+                    pred_date_id,
+                ): model_id
+                for model_id in models
+            }
+            with stage("publish"):
+                for future, model_id in published.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(
+                            f"Failed to publish model {model_id} for date_id {pred_date_id}: {e}"
+                        )
+                        failures.append((model_id, pred_date_id))
+
+    logger.info(
+        f"Batch inference completed for {len(models)} models and {len(pred_date_ids)} days."
+    )
+
+    if failures:
+        raise RuntimeError(f"Could not publish (model_id, pred_date_id) {failures}")
@@ -0,0 +1,113 @@
+import logging
+import numpy as np
+import xgboost as xgb
+from app.services.features import compute_features
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+# Days loaded per batch; whole days keep the temporal features complete
+DAYS_PER_BATCH = 20
+
+
+class DayBatchIter(xgb.DataIter):
+    """
+    XGBoost data iterator streaming training data in batches of whole days.
+
+    Every batch is read, featurized and handed to XGBoost, which copies it into
+    its on-disk cache; only one batch is held in memory at a time, however long
+    the training window is.
+
+    Attributes:
+        batches (list): The date IDs of every batch.
+        read_days (Callable[[List[int]], pd.DataFrame]): Reads the rows of some days.
+        temporal (bool): Whether to compute the temporal features.
+    """
+
+    def __init__(
+        self, date_ids, read_days, cache_prefix, temporal=False, days_per_batch=None
+    ):
+        """
+        Initialize the iterator.
+
+        Args:
+            date_ids (List[int]): The date IDs to stream, in order.
+            read_days (Callable[[List[int]], pd.DataFrame]): Reads the rows of some days.
+            cache_prefix (str): Path prefix of XGBoost's external memory cache files.
+            temporal (bool): Whether to compute the temporal features.
+            days_per_batch (int): Days per batch (default is DAYS_PER_BATCH).
+        """
+        days_per_batch = days_per_batch or DAYS_PER_BATCH
+        self.batches = [
+            date_ids[start : start + days_per_batch]
+            for start in range(0, len(date_ids), days_per_batch)
+        ]
+        self.read_days = read_days
+        self.temporal = temporal
+        self._position = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        """
+        Pass the next batch to XGBoost.
+
+        Args:
+            input_data (Callable): XGBoost's callback receiving the batch.
+
+        Returns:
+            int: 1 if a batch was passed, 0 at the end of the data.
+        """
+        if self._position == len(self.batches):
+            return 0
+
+        date_ids = self.batches[self._position]
+        X, y = load_batch(self.read_days(date_ids), self.temporal)
+        logger.info(f"Streaming date_ids {date_ids[0]}-{date_ids[-1]}, {len(y)} rows.")
+        input_data(data=X, label=y)
+        self._position += 1
+        return 1
+
+    def reset(self):
+        """
+        Rewind the iterator to the first batch.
+        """
+        self._position = 0
+
+
+def load_batch(df, temporal=False):
+    """
+    Featurize stock data and keep the rows with a target.
+
+    Features are computed first, so that rows without a target still count as
+    history for the temporal features.
+
+    Args:
+        df (pd.DataFrame): The typed stock data.
+        temporal (bool): Whether to compute the temporal features.
+
+    Returns:
+        tuple: The float32 feature matrix and the target vector.
+    """
+    X, _ = compute_features(df, temporal=temporal)
+    has_target = df["target"].notna().to_numpy()
+    return X[has_target], df["target"].to_numpy(dtype=np.float32)[has_target]
+
+
+def external_memory_matrix(iterator, max_bin=256):
+    """
+    Build a DMatrix backed by XGBoost's on-disk cache from a data iterator.
+
+    Uses ExtMemQuantileDMatrix where the installed XGBoost provides it, and the
+    paged external memory DMatrix otherwise.
+
+    Args:
+        iterator (xgb.DataIter): The data iterator, with a cache prefix.
+        max_bin (int): Maximum number of histogram bins per feature.
+
+    Returns:
+        xgb.DMatrix: The external memory matrix.
+    """
+    ExtMemQuantileDMatrix = getattr(xgb, "ExtMemQuantileDMatrix", None)
+    if ExtMemQuantileDMatrix is not None:
+        return ExtMemQuantileDMatrix(iterator, max_bin=max_bin)
+    return xgb.DMatrix(iterator)
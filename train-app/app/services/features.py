@@ -0,0 +1,257 @@
+import logging
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+# Raw columns copied into the feature matrix as they are
+RAW_FEATURES = [
+    "seconds_in_bucket",
+    "imbalance_buy_sell_flag",
+    "imbalance_size",
+    "matched_size",
+    "bid_size",
+    "ask_size",
+    "reference_price",
+    "far_price",
+    "near_price",
+    "ask_price",
+    "bid_price",
+    "wap",
+]
+
+PRICES = [
+    "reference_price",
+    "far_price",
+    "near_price",
+    "ask_price",
+    "bid_price",
+    "wap",
+]
+
+FEATURE_NAMES = (
+    RAW_FEATURES
+    + ["imb_s1", "imb_s2"]
+    + [f"{left}_{right}_diff" for left, right in combinations(PRICES, 2)]
+)
+
+# Series tracked over a stock's auction window, in buckets of the same date
+TEMPORAL_COLUMNS = ["wap", "imb_s1", "imb_s2", "imbalance_size", "bid_size", "ask_size"]
+LAGS = (1, 2, 3)
+DELTAS = (1, 3)
+WINDOWS = (3, 6)
+
+# Number of buckets of history needed: the current one plus the longest lookback
+HISTORY = max(max(LAGS), max(DELTAS), max(WINDOWS) - 1) + 1
+
+TEMPORAL_FEATURE_NAMES = [
+    name
+    for column in TEMPORAL_COLUMNS
+    for name in (
+        [f"{column}_lag_{lag}" for lag in LAGS]
+        + [f"{column}_delta_{delta}" for delta in DELTAS]
+        + [f"{column}_mean_{window}" for window in WINDOWS]
+    )
+]
+
+
+def feature_names(temporal=False):
+    """
+    Return the feature names of a model, in matrix column order.
+
+    Args:
+        temporal (bool): Whether the model uses the temporal features.
+
+    Returns:
+        list: The feature names.
+    """
+    return FEATURE_NAMES + TEMPORAL_FEATURE_NAMES if temporal else list(FEATURE_NAMES)
+
+
+def uses_temporal_features(num_features):
+    """
+    Tell from a model's number of features whether it uses the temporal features.
+
+    Args:
+        num_features (int): Number of features of the model, e.g. Booster.num_features().
+
+    Returns:
+        bool: True for models trained with the temporal features.
+    """
+    return num_features == len(FEATURE_NAMES) + len(TEMPORAL_FEATURE_NAMES)
+
+
+def _column(df, column):
+    return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _fill_snapshot_features(df, out):
+    """
+    Write the snapshot features of every row into out, one feature per row of out.
+    """
+    for position, column in enumerate(RAW_FEATURES):
+        out[position] = _column(df, column)
+
+    bid_size = _column(df, "bid_size")
+    ask_size = _column(df, "ask_size")
+    imbalance_size = _column(df, "imbalance_size")
+    matched_size = _column(df, "matched_size")
+
+    offset = len(RAW_FEATURES)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[offset] = (bid_size - ask_size) / (bid_size + ask_size)
+        out[offset + 1] = (imbalance_size - matched_size) / (
+            matched_size + imbalance_size
+        )
+
+    # Pairwise differences broadcast one price against all later prices at a time
+    prices = np.stack([_column(df, price) for price in PRICES])
+    position = offset + 2
+    for left in range(len(PRICES) - 1):
+        right = prices[left + 1 :]
+        np.subtract(
+            prices[left],
+            right,
+            out=out[position : position + len(right)],
+            casting="same_kind",
+        )
+        position += len(right)
+
+
+def _temporal_series(df):
+    """
+    Return the float64 values of every TEMPORAL_COLUMNS series, one row per series.
+    """
+    bid_size = _column(df, "bid_size")
+    ask_size = _column(df, "ask_size")
+    imbalance_size = _column(df, "imbalance_size")
+    matched_size = _column(df, "matched_size")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        imb_s1 = (bid_size - ask_size) / (bid_size + ask_size)
+        imb_s2 = (imbalance_size - matched_size) / (matched_size + imbalance_size)
+    series = {
+        "wap": _column(df, "wap"),
+        "imb_s1": imb_s1,
+        "imb_s2": imb_s2,
+        "imbalance_size": imbalance_size,
+        "bid_size": bid_size,
+        "ask_size": ask_size,
+    }
+    return np.stack([series[column] for column in TEMPORAL_COLUMNS])
+
+
+def _fill_column_features(history, out):
+    """
+    Write the lag, delta and rolling mean features of one series into out.
+
+    Args:
+        history (np.ndarray): Array of shape (HISTORY, rows); history[k] holds the
+            value k buckets back, NaN where the stock has no such bucket yet.
+        out (np.ndarray): Array of shape (features per series, rows) to fill.
+    """
+    position = 0
+    for lag in LAGS:
+        out[position] = history[lag]
+        position += 1
+    for delta in DELTAS:
+        np.subtract(history[0], history[delta], out=out[position], casting="same_kind")
+        position += 1
+
+    # Rolling means over the available buckets of each window, NaN-skipping
+    total = np.zeros(history.shape[1])
+    count = np.zeros(history.shape[1])
+    for lag in range(max(WINDOWS)):
+        valid = ~np.isnan(history[lag])
+        np.add(total, history[lag], out=total, where=valid)
+        count += valid
+        if lag + 1 in WINDOWS:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.divide(total, count, out=out[position], casting="same_kind")
+            position += 1
+
+
+def _fill_temporal_features(df, out):
+    """
+    Write the temporal features of every row of a frame into out.
+
+    Rows are ordered by (stock_id, date_id, seconds_in_bucket) once with a
+    vectorized sort; in that order the bucket k back is the row k positions
+    earlier, provided it belongs to the same stock and date. Features are
+    computed one series at a time on contiguous shifted slices and scattered
+    back to the row order of df.
+
+    Args:
+        df (pd.DataFrame): Stock data with stock_id, date_id and seconds_in_bucket.
+        out (np.ndarray): Array of shape (len(TEMPORAL_FEATURE_NAMES), rows) to fill.
+    """
+    num_rows = len(df)
+    order = np.lexsort(
+        (
+            df["seconds_in_bucket"].to_numpy(),
+            df["date_id"].to_numpy(),
+            df["stock_id"].to_numpy(),
+        )
+    )
+
+    # Position of every sorted row within its (stock_id, date_id) group
+    stock_id = df["stock_id"].to_numpy()[order]
+    date_id = df["date_id"].to_numpy()[order]
+    new_group = np.ones(num_rows, dtype=bool)
+    new_group[1:] = (stock_id[1:] != stock_id[:-1]) | (date_id[1:] != date_id[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(num_rows), 0))
+    position = np.arange(num_rows) - group_start
+    first_buckets = [position < lag for lag in range(HISTORY)]
+
+    # Sorted position of every row of df, to gather results back in its order
+    rank = np.empty(num_rows, dtype=np.int64)
+    rank[order] = np.arange(num_rows)
+
+    per_column = len(TEMPORAL_FEATURE_NAMES) // len(TEMPORAL_COLUMNS)
+    history = np.empty((HISTORY, num_rows))
+    features = np.empty((per_column, num_rows), dtype=np.float32)
+    for index, series in enumerate(_temporal_series(df)):
+        history[0] = series[order]
+        for lag in range(1, HISTORY):
+            history[lag, lag:] = history[0, :-lag]
+            np.copyto(history[lag], np.nan, where=first_buckets[lag])
+        _fill_column_features(history, features)
+        for offset, values in enumerate(features):
+            np.take(values, rank, out=out[index * per_column + offset])
+
+
+def compute_features(df: pd.DataFrame, temporal=False):
+    """
+    Compute the model's feature matrix into one preallocated float32 array.
+
+    Produces the same features, in the same order, as the model has always been
+    trained and scored on: the raw order book columns, the two imbalance ratios
+    and the fifteen pairwise price differences. Derived values are computed in
+    float64 and stored as float32, which is the precision XGBoost uses.
+
+    With temporal, the lags, deltas and rolling means of TEMPORAL_COLUMNS over the
+    previous buckets of the same stock and date are appended. Rows may come in any
+    order; history is looked up by (stock_id, date_id, seconds_in_bucket).
+
+    The matrix is returned column-major (Fortran order), so that every feature is
+    written as one contiguous run.
+
+    Args:
+        df (pd.DataFrame): Stock data with the RAW_FEATURES columns, plus stock_id
+            and date_id for the temporal features.
+        temporal (bool): Whether to append the temporal features.
+
+    Returns:
+        tuple: Float32 array of shape (len(df), number of features), in Fortran
+            order, and the list of feature names.
+    """
+    names = feature_names(temporal)
+    # One row per feature; its transpose is the (rows, features) matrix
+    buffer = np.empty((len(names), len(df)), dtype=np.float32)
+
+    _fill_snapshot_features(df, buffer[: len(FEATURE_NAMES)])
+    if temporal:
+        _fill_temporal_features(df, buffer[len(FEATURE_NAMES) :])
+    return buffer.T, names
+
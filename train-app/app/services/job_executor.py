@@ -0,0 +1,321 @@
+import os
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Optional
+from app.services import job_metrics
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+# Lifecycle of a job: queued -> running -> succeeded | failed, or queued -> cancelled
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED}
+
+
+@dataclass
+class Job:
+    """
+    A unit of work run by the JobExecutor.
+
+    Attributes:
+        job_id (str): Unique identifier of the job.
+        kind (str): Kind of job, e.g. "train" or "inference".
+        fn (Callable): Module-level function run in a worker process.
+        request (Any): The picklable request passed to fn.
+        state (str): One of queued, running, succeeded, failed or cancelled.
+        submitted_at (float): Time the job was submitted.
+        started_at (Optional[float]): Time the job started running.
+        finished_at (Optional[float]): Time the job finished.
+        error (Optional[str]): Error message of a failed job.
+        metrics (dict): Stage timings, current stage and MAE reported by the job.
+    """
+
+    job_id: str
+    kind: str
+    fn: Callable
+    request: Any
+    state: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    metrics: dict = field(default_factory=dict)
+
+
+# Queue the metrics of the running jobs are reported on, set in every worker
+_progress = None
+
+
+def _init_worker(progress):
+    global _progress
+    _progress = progress
+
+
+def _report(job_id, summary):
+    _progress.put((job_id, summary))
+
+
+def run_job(job_id, fn, request):
+    """
+    Run a job in a worker process, reporting its metrics as its stages run.
+
+    Args:
+        job_id (str): ID of the job.
+        fn (Callable): The job function.
+        request (Any): The request passed to fn.
+
+    Returns:
+        dict: The final metrics of the job.
+    """
+    metrics = job_metrics.start_job(job_id, _report)
+    fn(request)
+    return metrics.summary()
+
+
+class JobExecutor:
+    """
+    Runs blocking jobs in a bounded pool of worker processes.
+
+    Jobs wait in a FIFO queue until a worker is free and fewer than their kind's
+    limit of jobs of the same kind are running, so e.g. inference is not starved
+    by long training jobs. Workers are spawned once and reused, keeping their
+    model and day caches warm between jobs. A worker that dies, e.g. killed for
+    running out of memory, fails its job and the pool is started again.
+
+    Only queued jobs can be cancelled; a running job holds its worker process
+    until it finishes.
+
+    Jobs report their stage metrics over a queue while they run; a thread of the
+    executor applies them to the jobs.
+
+    Attributes:
+        max_workers (int): Number of worker processes.
+        limits (dict): Maximum running jobs per kind; kinds not listed may use
+            every worker.
+        max_history (int): Finished jobs kept for lookup.
+    """
+
+    def __init__(self, max_workers=2, limits=None, max_history=1000):
+        """
+        Initialize the JobExecutor. Worker processes start with the first job.
+
+        Args:
+            max_workers (int): Number of worker processes (default is 2).
+            limits (Optional[dict]): Maximum running jobs per kind.
+            max_history (int): Finished jobs kept for lookup (default is 1000).
+        """
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = None
+
+    def submit(self, kind, fn, request) -> str:
+        """
+        Queue a job and start it as soon as the limits allow.
+
+        Args:
+            kind (str): Kind of job, used for the concurrency limits.
+            fn (Callable): Module-level function to run in a worker process.
+            request (Any): The picklable request passed to fn.
+
+        Returns:
+            str: ID of the job.
+        """
+        job = Job(job_id=uuid.uuid4().hex, kind=kind, fn=fn, request=request)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        logger.info(f"Queued {kind} job {job.job_id}.")
+        self._dispatch()
+        return job.job_id
+
+    def get(self, job_id) -> Optional[Job]:
+        """
+        Return a job by ID.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            Optional[Job]: The job, or None if it is unknown or was pruned.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, kind=None, state=None):
+        """
+        Return the known jobs, oldest first.
+
+        Args:
+            kind (Optional[str]): Only return jobs of this kind.
+            state (Optional[str]): Only return jobs in this state.
+
+        Returns:
+            List[Job]: The matching jobs.
+        """
+        with self._lock:
+            return [
+                job
+                for job in self._jobs.values()
+                if (kind is None or job.kind == kind)
+                and (state is None or job.state == state)
+            ]
+
+    def cancel(self, job_id) -> bool:
+        """
+        Cancel a queued job.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            bool: True if the job was cancelled, False if it is already running
+                or finished.
+
+        Raises:
+            KeyError: If the job is unknown.
+        """
+        with self._lock:
+            job = self._jobs[job_id]
+            if job.state != QUEUED:
+                return False
+            job.state = CANCELLED
+            job.finished_at = time.time()
+        logger.info(f"Cancelled {job.kind} job {job_id}.")
+        return True
+
+    def shutdown(self):
+        """
+        Cancel the queued jobs and stop the worker processes once the running
+        jobs finish.
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.state == QUEUED:
+                    job.state = CANCELLED
+                    job.finished_at = time.time()
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        if self._progress is not None:
+            # Stops the metrics thread
+            self._progress.put(None)
+            self._progress = None
+
+    def _dispatch(self):
+        # Start queued jobs, oldest first, while workers and kind limits allow
+        started = []
+        with self._lock:
+            running = [job for job in self._jobs.values() if job.state == RUNNING]
+            for job in list(self._jobs.values()):
+                if len(running) >= self.max_workers:
+                    break
+                if job.state != QUEUED:
+                    continue
+                running_of_kind = sum(1 for other in running if other.kind == job.kind)
+                if running_of_kind >= self.limits.get(job.kind, self.max_workers):
+                    continue
+                job.state = RUNNING
+                job.started_at = time.time()
+                running.append(job)
+                started.append((job, self._submit_to_pool(job)))
+
+        # Callbacks of futures that are already done run immediately, so they
+        # are added without holding the lock
+        for job, future in started:
+            logger.info(f"Started {job.kind} job {job.job_id}.")
+            future.add_done_callback(lambda future, job=job: self._on_done(job, future))
+
+    def _submit_to_pool(self, job):
+        # Called with the lock held
+        if self._progress is None:
+            self._progress = self._context.SimpleQueue()
+            threading.Thread(
+                target=self._receive_metrics, args=(self._progress,), daemon=True
+            ).start()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._progress,),
+            )
+        try:
+            return self._pool.submit(run_job, job.job_id, job.fn, job.request)
+        except BrokenProcessPool:
+            logger.warning("Worker pool is broken, starting a new one.")
+            self._pool.shutdown(wait=False)
+            self._pool = None
+            return self._submit_to_pool(job)
+
+    def _on_done(self, job, future):
+        error = future.exception()
+        with self._lock:
+            job.finished_at = time.time()
+            if error is None:
+                job.state = SUCCEEDED
+                job.metrics = future.result()
+            else:
+                job.state = FAILED
+                job.error = f"{type(error).__name__}: {error}"
+        if error is None:
+            logger.info(f"Finished {job.kind} job {job.job_id}.")
+        else:
+            logger.error(f"{job.kind} job {job.job_id} failed: {job.error}")
+        self._dispatch()
+
+    def _receive_metrics(self, progress):
+        while True:
+            message = progress.get()
+            if message is None:
+                return
+            job_id, summary = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                # Succeeded jobs already hold their final metrics
+                if job is not None and job.state in (RUNNING, FAILED):
+                    job.metrics = summary
+
+    def _prune(self):
+        # Called with the lock held; forget the oldest finished jobs
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.state in FINISHED_STATES
+        ]
+        for job_id in finished[: max(len(finished) - self.max_history, 0)]:
+            del self._jobs[job_id]
+
+
+@lru_cache(maxsize=None)
+def get_job_executor():
+    """
+    Return the process-wide job executor configured from the environment.
+
+    Returns:
+        JobExecutor: The shared job executor.
+    """
+    return JobExecutor(
+        max_workers=int(os.getenv("JOB_WORKERS", 2)),
+        limits={
+            "train": int(os.getenv("TRAIN_JOB_LIMIT", 1)),
+            "inference": int(os.getenv("INFERENCE_JOB_LIMIT", 2)),
+            "batch_inference": int(os.getenv("BATCH_INFERENCE_JOB_LIMIT", 1)),
+        },
+    )
@@ -0,0 +1,156 @@
+import logging
+import threading
+from contextlib import contextmanager
+from time import time
+import psutil
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+# Interval between memory samples while a stage runs, in seconds
+SAMPLE_INTERVAL = 0.05
+
+
+class JobMetrics:
+    """
+    Per-stage wall time and peak memory of one job.
+
+    Memory is the resident set size of the whole process, sampled while a stage
+    runs. A stage entered several times, e.g. once per day, accumulates its wall
+    time and keeps the highest peak.
+
+    Attributes:
+        job_id (Optional[str]): ID of the job the metrics belong to.
+        stages (dict): Wall time in seconds and peak memory in bytes of every
+            finished stage, in the order the stages first ran.
+        current_stage (Optional[str]): The stage running now, if any.
+        mae (Optional[float]): Final mean absolute error of the job.
+    """
+
+    def __init__(self, job_id=None, report=None):
+        """
+        Initialize the JobMetrics.
+
+        Args:
+            job_id (Optional[str]): ID of the job the metrics belong to.
+            report (Optional[Callable]): Called with the job ID and the summary
+                whenever a stage starts or finishes.
+        """
+        self.job_id = job_id
+        self.stages = {}
+        self.current_stage = None
+        self.mae = None
+        self._report = report
+        self._process = psutil.Process()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a stage of the job and sample its peak memory.
+
+        Args:
+            name (str): Name of the stage.
+        """
+        self.current_stage = name
+        self._publish()
+        peak = [self._process.memory_info().rss]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(SAMPLE_INTERVAL):
+                peak[0] = max(peak[0], self._process.memory_info().rss)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time()
+        try:
+            yield
+        finally:
+            seconds = time() - start
+            done.set()
+            sampler.join()
+            peak[0] = max(peak[0], self._process.memory_info().rss)
+
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "peak_rss_bytes": 0})
+            stage["seconds"] += seconds
+            stage["peak_rss_bytes"] = max(stage["peak_rss_bytes"], peak[0])
+            if self.current_stage == name:
+                self.current_stage = None
+            logger.info(
+                f"Stage {name} took {seconds:.2f}s, peak RSS {peak[0] / 2**20:.0f} MiB"
+            )
+            self._publish()
+
+    def set_mae(self, mae):
+        """
+        Record the final mean absolute error of the job.
+
+        Args:
+            mae (float): The mean absolute error.
+        """
+        self.mae = float(mae)
+        self._publish()
+
+    def summary(self):
+        """
+        Return the metrics as plain data.
+
+        Returns:
+            dict: The stages, the current stage and the MAE.
+        """
+        return {
+            "stages": {name: dict(stage) for name, stage in self.stages.items()},
+            "current_stage": self.current_stage,
+            "mae": self.mae,
+        }
+
+    def _publish(self):
+        if self._report is not None:
+            try:
+                self._report(self.job_id, self.summary())
+            except Exception as e:
+                logger.warning(f"Could not report metrics of job {self.job_id}: {e}")
+
+
+# Metrics of the job running in this process; jobs run one at a time per worker
+_current = JobMetrics()
+
+
+def start_job(job_id, report=None) -> JobMetrics:
+    """
+    Start collecting the metrics of a new job in this process.
+
+    Args:
+        job_id (str): ID of the job.
+        report (Optional[Callable]): Called with the job ID and the summary
+            whenever a stage starts or finishes.
+
+    Returns:
+        JobMetrics: The metrics of the job.
+    """
+    global _current
+    _current = JobMetrics(job_id, report)
+    return _current
+
+
+def current_job() -> JobMetrics:
+    """
+    Return the metrics of the job running in this process.
+
+    Returns:
+        JobMetrics: The metrics of the current job.
+    """
+    return _current
+
+
+def stage(name):
+    """
+    Time a stage of the current job, see JobMetrics.stage.
+
+    Args:
+        name (str): Name of the stage.
+
+    Returns:
+        contextmanager: Context manager timing the stage.
+    """
+    return _current.stage(name)
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+import numpy as np
+from app.services.model_cache import get_model_cache
+from app.services.predictor import feature_matrix
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+
+class BatcherMetrics:
+    """
+    Running counters of a MicroBatcher.
+
+    Attributes:
+        batches (int): Number of batches scored.
+        requests (int): Number of requests scored.
+        rows (int): Number of rows scored.
+        full_batches (int): Batches flushed because they reached max_batch_rows.
+        fill_sum (float): Sum of the batch fill ratios, rows / max_batch_rows.
+        queue_delay_sum (float): Sum of the queue delays of all requests, in seconds.
+        queue_delay_max (float): Longest queue delay of a request, in seconds.
+    """
+
+    def __init__(self):
+        """
+        Initialize all counters to zero.
+        """
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.full_batches = 0
+        self.fill_sum = 0.0
+        self.queue_delay_sum = 0.0
+        self.queue_delay_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, num_requests, num_rows, fill, queue_delays, full):
+        """
+        Add one scored batch to the counters.
+
+        Args:
+            num_requests (int): Requests in the batch.
+            num_rows (int): Rows in the batch.
+            fill (float): Fill ratio of the batch.
+            queue_delays (List[float]): Queue delay of every request, in seconds.
+            full (bool): Whether the batch was flushed for being full.
+        """
+        with self._lock:
+            self.batches += 1
+            self.requests += num_requests
+            self.rows += num_rows
+            self.full_batches += int(full)
+            self.fill_sum += fill
+            self.queue_delay_sum += sum(queue_delays)
+            self.queue_delay_max = max(self.queue_delay_max, max(queue_delays))
+
+    def summary(self):
+        """
+        Return the counters and the derived averages.
+
+        Returns:
+            dict: The metrics.
+        """
+        with self._lock:
+            batches = max(self.batches, 1)
+            requests = max(self.requests, 1)
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "rows": self.rows,
+                "full_batches": self.full_batches,
+                "mean_requests_per_batch": self.requests / batches,
+                "mean_rows_per_batch": self.rows / batches,
+                "mean_batch_fill": self.fill_sum / batches,
+                "mean_queue_delay_ms": 1000 * self.queue_delay_sum / requests,
+                "max_queue_delay_ms": 1000 * self.queue_delay_max,
+            }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests for the same model into one batch.
+
+    Requests wait in a per-model queue until the queued rows reach max_batch_rows
+    or the oldest request has waited max_wait seconds. The batch is then scored in
+    a worker thread with a single predict call over the stacked feature matrices,
+    and every caller receives its own slice of the predictions. Each request is
+    featurized on its own, so requests never see each other's rows as history.
+
+    Attributes:
+        max_batch_rows (int): Rows that trigger an immediate flush.
+        max_wait (float): Longest time a request waits for others, in seconds.
+        metrics (BatcherMetrics): Batch fill and queue delay counters.
+    """
+
+    def __init__(self, max_batch_rows=4096, max_wait=0.002):
+        """
+        Initialize the MicroBatcher.
+
+        Args:
+            max_batch_rows (int): Rows that trigger an immediate flush (default is 4096).
+            max_wait (float): Longest wait for other requests, in seconds (default is 2 ms).
+        """
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait
+        self.metrics = BatcherMetrics()
+        self._pending = {}
+        self._timers = {}
+        # Running scoring tasks, referenced until they finish
+        self._tasks = set()
+
+    async def submit(self, model_id, df):
+        """
+        Queue rows for scoring and wait for their predictions.
+
+        Args:
+            model_id (int): ID of the model to score with.
+            df (pd.DataFrame): The stock data to score.
+
+        Returns:
+            np.ndarray: The prediction of every row, in the row order of df.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(model_id, [])
+        pending.append((df, future, time.monotonic()))
+
+        if sum(len(queued) for queued, _, _ in pending) >= self.max_batch_rows:
+            self._flush(model_id, full=True)
+        elif model_id not in self._timers:
+            self._timers[model_id] = loop.call_later(
+                self.max_wait, self._flush, model_id
+            )
+        return await future
+
+    def _flush(self, model_id, full=False):
+        timer = self._timers.pop(model_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model_id, [])
+        if batch:
+            task = asyncio.ensure_future(self._score(model_id, batch, full))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, model_id, batch, full):
+        started = time.monotonic()
+        frames = [df for df, _, _ in batch]
+        try:
+            predictions = await asyncio.to_thread(score_batch, model_id, frames)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        num_rows = len(predictions)
+        self.metrics.record(
+            num_requests=len(batch),
+            num_rows=num_rows,
+            fill=min(num_rows / self.max_batch_rows, 1.0),
+            queue_delays=[started - enqueued for _, _, enqueued in batch],
+            full=full,
+        )
+
+        offsets = np.cumsum([0] + [len(df) for df in frames])
+        for (_, future, _), start, end in zip(batch, offsets[:-1], offsets[1:]):
+            if not future.done():
+                future.set_result(predictions[start:end])
+
+
+def score_batch(model_id, frames):
+    """
+    Score several frames with one predict call.
+
+    Args:
+        model_id (int): ID of the model to score with.
+        frames (List[pd.DataFrame]): The stock data of every request.
+
+    Returns:
+        np.ndarray: The predictions of all rows, frame after frame.
+    """
+    model = get_model_cache().get(model_id)
+    X = np.concatenate([feature_matrix(model, df) for df in frames])
+    return model.inplace_predict(X)
+
+
+@lru_cache(maxsize=None)
+def get_micro_batcher():
+    """
+    Return the process-wide micro-batcher configured from the environment.
+
+    Returns:
+        MicroBatcher: The shared micro-batcher.
+    """
+    return MicroBatcher(
+        max_batch_rows=int(os.getenv("PREDICT_MAX_BATCH_ROWS", 4096)),
+        max_wait=float(os.getenv("PREDICT_MAX_WAIT_MS", 2)) / 1000,
+    )
@@ -0,0 +1,98 @@
+import gzip
+import logging
+import os
+import pickle
+import xgboost as xgb
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+# File extension of every artifact format recorded in the model registry
+MODEL_FORMATS = {
+    "ubj": ".ubj",
+    "ubj.gz": ".ubj.gz",
+    "pickle": ".pickle",
+}
+
+GZIP_MAGIC = b"\x1f\x8b"
+# Pickle protocols 2+ start with the PROTO opcode
+PICKLE_MAGIC = b"\x80"
+
+
+def get_model_format():
+    """
+    Return the artifact format new models are saved in, from MODEL_FORMAT.
+
+    Returns:
+        str: One of MODEL_FORMATS, "ubj" by default.
+
+    Raises:
+        ValueError: If MODEL_FORMAT is not a known format.
+    """
+    model_format = os.getenv("MODEL_FORMAT", "ubj")
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(
+            f"Unknown MODEL_FORMAT {model_format!r}, expected one of {list(MODEL_FORMATS)}"
+        )
+    return model_format
+
+
+def model_format_of(path) -> str:
+    """
+    Return the artifact format of a model file from its extension.
+
+    Args:
+        path (str): Path or S3 key of the artifact.
+
+    Returns:
+        str: One of MODEL_FORMATS, "pickle" for unknown extensions.
+    """
+    for model_format, extension in sorted(
+        MODEL_FORMATS.items(), key=lambda item: -len(item[1])
+    ):
+        if str(path).endswith(extension):
+            return model_format
+    return "pickle"
+
+
+def serialize_model(model: xgb.Booster, model_format="ubj") -> bytes:
+    """
+    Serialize a model in one of the artifact formats.
+
+    Args:
+        model (xgb.Booster): The model.
+        model_format (str): One of MODEL_FORMATS.
+
+    Returns:
+        bytes: The artifact contents.
+    """
+    if model_format == "pickle":
+        return pickle.dumps(model)
+
+    data = bytes(model.save_raw(raw_format="ubj"))
+    if model_format == "ubj.gz":
+        data = gzip.compress(data, compresslevel=6)
+    return data
+
+
+def deserialize_model(data: bytes) -> xgb.Booster:
+    """
+    Load a model from the contents of an artifact of any format.
+
+    The format is detected from the leading bytes, so artifacts registered before
+    the format was recorded, which are all pickles, still load.
+
+    Args:
+        data (bytes): The artifact contents.
+
+    Returns:
+        xgb.Booster: The model.
+    """
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    if data[:1] == PICKLE_MAGIC:
+        return pickle.loads(data)
+
+    model = xgb.Booster()
+    model.load_model(bytearray(data))
+    return model
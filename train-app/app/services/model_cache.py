@@ -0,0 +1,164 @@
+import os
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+import xgboost as xgb
+from app.services.api_handler import APIHandler
+from app.services.s3_handler import get_s3_handler
+from app.services.artifact_cache import get_artifact_cache
+from app.services.model_artifacts import deserialize_model
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+
+@dataclass
+class CachedModel:
+    """
+    A deserialized model held by the ModelCache.
+
+    Attributes:
+        model (xgb.Booster): The model.
+        artifact_path (str): S3 path of the model artifact.
+        etag (str): ETag of the artifact the model was loaded from.
+        num_bytes (int): Size of the artifact, approximating the model's memory.
+        validated_at (float): Monotonic time the ETag was last checked.
+    """
+
+    model: xgb.Booster
+    artifact_path: str
+    etag: str
+    num_bytes: int
+    validated_at: float
+
+
+class ModelCache:
+    """
+    An in-process LRU cache of deserialized models keyed by model_id.
+
+    A cached model is returned only while the artifact's ETag is unchanged,
+    otherwise it is downloaded and loaded again. The ETag is checked with an S3
+    HEAD request at most once every revalidate_seconds, so hits in between cost
+    no request at all.
+
+    Models are evicted least-recently-used first once the cached models grow
+    beyond max_bytes; the most recent model is always kept.
+
+    Attributes:
+        max_bytes (int): Memory limit of the cached models.
+        base_api (str): The base URL of the model registry API.
+        model_api (str): The model registry endpoint.
+        revalidate_seconds (float): Interval between ETag checks of a model.
+    """
+
+    def __init__(self, max_bytes, base_api, model_api, revalidate_seconds=0):
+        """
+        Initialize the ModelCache.
+
+        Args:
+            max_bytes (int): Memory limit of the cached models.
+            base_api (str): The base URL of the model registry API.
+            model_api (str): The model registry endpoint.
+            revalidate_seconds (float): Interval between ETag checks of a model
+                (default is 0, checking on every hit).
+        """
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.base_api = base_api
+        self.model_api = model_api
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def s3_handler(self):
+        """
+        S3Handler: The process-wide handler, shared with the other S3 users.
+        """
+        return get_s3_handler()
+
+    def get(self, model_id) -> xgb.Booster:
+        """
+        Return a model, loading it from S3 unless a current copy is cached.
+
+        Args:
+            model_id (int): ID of the model.
+
+        Returns:
+            xgb.Booster: The model.
+        """
+        with self._lock:
+            cached = self._models.get(model_id)
+
+        if cached is not None:
+            if time.monotonic() - cached.validated_at < self.revalidate_seconds:
+                self._touch(model_id)
+                return cached.model
+
+            if self.s3_handler.get_etag(cached.artifact_path) == cached.etag:
+                cached.validated_at = time.monotonic()
+                self._touch(model_id)
+                logger.info(f"Model {model_id} served from the model cache.")
+                return cached.model
+            logger.info(f"Artifact of model {model_id} changed, reloading it.")
+            artifact_path = cached.artifact_path
+        else:
+            # Registry rows are immutable, so the path is looked up only once
+            api_handler = APIHandler(self.base_api)
+            record = api_handler.get(self.model_api, {"model_id": model_id})[0]
+            artifact_path = record["model_artifact_path"]
+
+        # Shared on disk with the other processes, e.g. the job workers
+        data, etag = get_artifact_cache().get_bytes(self.s3_handler, artifact_path)
+        model = deserialize_model(data)
+        cached = CachedModel(
+            model=model,
+            artifact_path=artifact_path,
+            etag=etag,
+            num_bytes=len(data),
+            validated_at=time.monotonic(),
+        )
+        self.put(model_id, cached)
+        logger.info(f"Model {model_id} loaded into the model cache.")
+        return model
+
+    def _touch(self, model_id):
+        # Mark as recently used for LRU eviction
+        with self._lock:
+            if model_id in self._models:
+                self._models.move_to_end(model_id)
+
+    def put(self, model_id, cached: CachedModel):
+        """
+        Add a model and evict least-recently-used models if the cache is full.
+
+        Args:
+            model_id (int): ID of the model.
+            cached (CachedModel): The model and its artifact metadata.
+        """
+        with self._lock:
+            self._models[model_id] = cached
+            self._models.move_to_end(model_id)
+            total_bytes = sum(entry.num_bytes for entry in self._models.values())
+            while total_bytes > self.max_bytes and len(self._models) > 1:
+                evicted_id, evicted = self._models.popitem(last=False)
+                total_bytes -= evicted.num_bytes
+                logger.info(f"Evicted model {evicted_id} from the model cache.")
+
+
+@lru_cache(maxsize=None)
+def get_model_cache():
+    """
+    Return the process-wide model cache configured from the environment.
+
+    Returns:
+        ModelCache: The shared model cache.
+    """
+    return ModelCache(
+        max_bytes=int(os.getenv("MODEL_CACHE_MAX_BYTES", 1024**3)),
+        base_api=os.getenv("BASE_API"),
+        model_api=os.getenv("MODEL_API"),
+        revalidate_seconds=float(os.getenv("MODEL_CACHE_REVALIDATE_SECONDS", 30)),
+    )
@@ -0,0 +1,51 @@
+import logging
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from app.models import OrderBookRow
+from app.services.features import compute_features, uses_temporal_features
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+INTEGER_FIELDS = {"stock_id", "date_id", "seconds_in_bucket", "imbalance_buy_sell_flag"}
+
+
+def rows_to_frame(rows) -> pd.DataFrame:
+    """
+    Build a stock data frame from order book rows, one typed array per column.
+
+    Args:
+        rows (List[OrderBookRow]): The snapshots.
+
+    Returns:
+        pd.DataFrame: The snapshots, with missing values as NaN.
+    """
+    return pd.DataFrame(
+        {
+            field: np.array(
+                [getattr(row, field) for row in rows],
+                dtype=np.int32 if field in INTEGER_FIELDS else np.float64,
+            )
+            for field in OrderBookRow.model_fields
+        }
+    )
+
+
+def feature_matrix(model: xgb.Booster, df: pd.DataFrame) -> np.ndarray:
+    """
+    Compute the features a model expects as a C-contiguous float32 array.
+
+    Temporal features are included for models trained with them; they only see
+    the history present in df.
+
+    Args:
+        model (xgb.Booster): The model.
+        df (pd.DataFrame): The stock data to score.
+
+    Returns:
+        np.ndarray: The feature matrix, one row per row of df.
+    """
+    temporal = uses_temporal_features(model.num_features())
+    X, _ = compute_features(df, temporal=temporal)
+    return np.ascontiguousarray(X)
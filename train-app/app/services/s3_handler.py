@@ -1,35 +1,90 @@
 import os
+import shutil
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from functools import lru_cache
 import logging
 
 # Configure logger
 logger = logging.getLogger("optiver." + __name__)
 
+MiB = 1024**2
+
+# Read size when streaming an object body to a file
+DOWNLOAD_CHUNK_BYTES = MiB
+
+
+@lru_cache(maxsize=None)
+def get_transfer_config():
+    """
+    Return the multipart transfer settings configured from the environment.
+
+    Objects above S3_MULTIPART_THRESHOLD are transferred in S3_MULTIPART_CHUNKSIZE
+    parts, S3_MAX_CONCURRENCY at a time.
+
+    Returns:
+        TransferConfig: The shared transfer settings.
+    """
+    return TransferConfig(
+        multipart_threshold=int(os.getenv("S3_MULTIPART_THRESHOLD", 16 * MiB)),
+        multipart_chunksize=int(os.getenv("S3_MULTIPART_CHUNKSIZE", 16 * MiB)),
+        max_concurrency=int(os.getenv("S3_MAX_CONCURRENCY", 10)),
+        use_threads=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """
+    Return the process-wide S3 client, created on first use.
+
+    boto3 clients are thread-safe, so every handler, thread and transfer of the
+    process shares this one and its connection pool, which is sized for the
+    transfer concurrency.
+
+    Returns:
+        boto3.client: The shared S3 client.
+    """
+    return boto3.client(
+        "s3",
+        aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
+        aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
+        region_name=os.environ["REGION"],
+        config=Config(
+            max_pool_connections=2 * get_transfer_config().max_concurrency
+        ),
+    )
+
 
 class S3Handler:
     """
     A class to handle S3 operations such as downloading and uploading files.
 
+    Handlers are cheap: they share the process-wide client and transfer settings
+    unless given their own.
+
     Attributes:
         bucket_name (str): The name of the S3 bucket.
         s3_client (boto3.client): The Boto3 S3 client.
+        transfer_config (TransferConfig): Multipart transfer settings.
     """
 
-    def __init__(self):
+    def __init__(self, s3_client=None, transfer_config=None, bucket_name=None):
         """
         Initialize the S3Handler with AWS credentials and S3 bucket information.
+
+        Args:
+            s3_client (Optional[boto3.client]): Client to use instead of the
+                shared one.
+            transfer_config (Optional[TransferConfig]): Transfer settings to use
+                instead of the shared ones.
+            bucket_name (Optional[str]): Bucket to use instead of S3_BUCKET_NAME.
         """
-        self.bucket_name = os.environ["S3_BUCKET_NAME"]
-        access_key_id = os.environ["AWS_ACCESS_KEY_ID"]
-        secret_access_key = os.environ["AWS_SECRET_ACCESS_KEY"]
-        region = os.environ["REGION"]
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=access_key_id,
-            aws_secret_access_key=secret_access_key,
-            region_name=region,
-        )
+        self.bucket_name = bucket_name or os.environ["S3_BUCKET_NAME"]
+        self.s3_client = s3_client or get_s3_client()
+        self.transfer_config = transfer_config or get_transfer_config()
 
     def download_file(self, s3_path, local_dir):
         """
@@ -45,13 +100,83 @@ class S3Handler:
         try:
             file_name = os.path.basename(s3_path)
             local_path = os.path.join(local_dir, file_name)
-            self.s3_client.download_file(self.bucket_name, s3_path, local_path)
+            self.s3_client.download_file(
+                self.bucket_name, s3_path, local_path, Config=self.transfer_config
+            )
             logger.info(f"File downloaded from S3: {s3_path} to {local_path}")
             return local_path
         except ClientError as e:
             logger.error(f"Error downloading file from S3: {e}")
             return None
 
+    def download_fileobj(self, s3_path, fileobj):
+        """
+        Download an object from S3 into a writable binary file object, in
+        concurrent ranged parts for large objects.
+
+        Args:
+            s3_path (str): The S3 path of the object.
+            fileobj (BinaryIO): The file object to write to, e.g. io.BytesIO.
+        """
+        self.s3_client.download_fileobj(
+            self.bucket_name, s3_path, fileobj, Config=self.transfer_config
+        )
+        logger.info(f"Object downloaded from S3: {s3_path}")
+
+    def download_version(self, s3_path, etag, fileobj):
+        """
+        Download one version of an object, named by its ETag, into a writable
+        binary file object.
+
+        Args:
+            s3_path (str): The S3 path of the object.
+            etag (str): The ETag of the version to download.
+            fileobj (BinaryIO): The file object to write to.
+
+        Raises:
+            ClientError: With code PreconditionFailed if the object has changed.
+        """
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name, Key=s3_path, IfMatch=etag
+        )
+        shutil.copyfileobj(response["Body"], fileobj, DOWNLOAD_CHUNK_BYTES)
+        logger.info(f"Object downloaded from S3: {s3_path}")
+
+    def get_etag(self, s3_path):
+        """
+        Retrieve the ETag of an object without downloading it.
+
+        Args:
+            s3_path (str): The S3 path of the object.
+
+        Returns:
+            str: The object's ETag.
+        """
+        response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_path)
+        return response["ETag"].strip('"')
+
+    def upload_fileobj(self, fileobj, s3_path):
+        """
+        Upload the contents of a readable binary file object to S3, in concurrent
+        multipart parts for large objects.
+
+        Args:
+            fileobj (BinaryIO): The file object to upload.
+            s3_path (str): The S3 path to upload the file to.
+
+        Raises:
+            ClientError: If the upload fails, so that nothing registers the
+                missing object.
+        """
+        try:
+            self.s3_client.upload_fileobj(
+                fileobj, self.bucket_name, s3_path, Config=self.transfer_config
+            )
+            logger.info(f"File uploaded to S3: {s3_path}")
+        except ClientError as e:
+            logger.error(f"Error uploading file to S3: {e}")
+            raise
+
     def upload_file(self, local_path, s3_path):
         """
         Upload a file from the local directory to S3.
@@ -64,7 +189,20 @@ class S3Handler:
             None
         """
         try:
-            self.s3_client.upload_file(local_path, self.bucket_name, s3_path)
+            self.s3_client.upload_file(
+                local_path, self.bucket_name, s3_path, Config=self.transfer_config
+            )
             logger.info(f"File uploaded to S3: {s3_path}")
         except ClientError as e:
             logger.error(f"Error uploading file to S3: {e}")
+
+
+@lru_cache(maxsize=None)
+def get_s3_handler():
+    """
+    Return the process-wide S3 handler for S3_BUCKET_NAME.
+
+    Returns:
+        S3Handler: The shared S3 handler.
+    """
+    return S3Handler()
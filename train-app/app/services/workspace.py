@@ -0,0 +1,163 @@
+import io
+import os
+import logging
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+# Configure logger
+logger = logging.getLogger("optiver." + __name__)
+
+
+class JobWorkspace:
+    """
+    Private scratch space of one job for intermediate files.
+
+    Files are kept in memory while the workspace holds at most max_memory_bytes,
+    larger ones are spilled to a directory of the workspace under root. Point
+    root at a tmpfs such as /dev/shm to keep spilled files off the disk too.
+
+    Every workspace has a unique ID and its own spill directory, so concurrent
+    jobs never share files. Use it as a context manager: everything it holds is
+    removed on exit, whether the job succeeded or not.
+
+    Attributes:
+        workspace_id (str): Unique identifier of the workspace.
+        max_memory_bytes (int): Memory limit of the files kept in memory.
+        root (Path): Directory the spill directories are created in.
+    """
+
+    def __init__(self, max_memory_bytes=256 * 1024**2, root="artifacts"):
+        """
+        Initialize the JobWorkspace. Nothing is written to disk until needed.
+
+        Args:
+            max_memory_bytes (int): Memory limit of the files kept in memory
+                (default is 256 MiB).
+            root (str): Directory the spill directories are created in.
+        """
+        self.workspace_id = uuid.uuid4().hex
+        self.max_memory_bytes = max_memory_bytes
+        self.root = Path(root)
+        self._files = {}
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    @property
+    def dir(self) -> Path:
+        """
+        Path: The workspace's spill directory, created on first use. Also for
+            libraries that write their own files, e.g. XGBoost's external memory
+            cache.
+        """
+        with self._lock:
+            if self._dir is None:
+                self._dir = self.root / self.workspace_id
+                os.makedirs(self._dir)
+            return self._dir
+
+    def put(self, name, data: bytes):
+        """
+        Store a file, in memory if it fits within the limit, else on disk.
+
+        Args:
+            name (str): Name of the file, unique within the workspace.
+            data (bytes): Contents of the file.
+        """
+        self.remove(name)
+        with self._lock:
+            in_memory = self._memory_bytes + len(data) <= self.max_memory_bytes
+            if in_memory:
+                self._memory_bytes += len(data)
+                self._files[name] = data
+                return
+        path = self.dir / name
+        with open(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._files[name] = path
+        logger.info(f"Spilled {name} ({len(data)} bytes) to {path}")
+
+    def open(self, name):
+        """
+        Open a file for reading.
+
+        Args:
+            name (str): Name of the file.
+
+        Returns:
+            BinaryIO: A readable binary file object.
+
+        Raises:
+            KeyError: If the workspace has no such file.
+        """
+        with self._lock:
+            stored = self._files[name]
+        if isinstance(stored, Path):
+            return open(stored, "rb")
+        return io.BytesIO(stored)
+
+    def read(self, name) -> bytes:
+        """
+        Read the contents of a file.
+
+        Args:
+            name (str): Name of the file.
+
+        Returns:
+            bytes: Contents of the file.
+
+        Raises:
+            KeyError: If the workspace has no such file.
+        """
+        with self.open(name) as f:
+            return f.read()
+
+    def remove(self, name):
+        """
+        Remove a file, if present, freeing its memory or disk space.
+
+        Args:
+            name (str): Name of the file.
+        """
+        with self._lock:
+            stored = self._files.pop(name, None)
+            if isinstance(stored, bytes):
+                self._memory_bytes -= len(stored)
+        if isinstance(stored, Path):
+            stored.unlink(missing_ok=True)
+
+    def cleanup(self):
+        """
+        Remove every file of the workspace and its spill directory.
+        """
+        with self._lock:
+            self._files.clear()
+            self._memory_bytes = 0
+            spill_dir, self._dir = self._dir, None
+        if spill_dir is not None:
+            try:
+                shutil.rmtree(spill_dir)
+            except Exception as e:
+                logger.error("Error cleaning up workspace %s: %s", spill_dir, str(e))
+
+
+def job_workspace():
+    """
+    Create a workspace configured from the environment.
+
+    Returns:
+        JobWorkspace: A new, empty workspace.
+    """
+    return JobWorkspace(
+        max_memory_bytes=int(os.getenv("WORKSPACE_MAX_MEMORY_BYTES", 256 * 1024**2)),
+        root=os.getenv("WORKSPACE_DIR", "artifacts"),
+    )
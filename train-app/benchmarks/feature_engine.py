@@ -0,0 +1,199 @@
+"""
+Benchmark of the feature engine against the previous ``generate_features``.
+
+Times both implementations on synthetic order book snapshots, checks that they
+produce the same feature matrix and prints the wall time, throughput and peak
+memory of each in one table. The engine with the temporal features appended is
+timed as well.
+
+Run from the train-app directory:
+
+    python -m benchmarks.feature_engine --rows 1000000 5000000 --repeat 3
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from app.services.features import compute_features
+
+
+def legacy_generate_features(df):
+    """
+    The previous ``data_operations.generate_features``, kept as the baseline.
+
+    Args:
+        df (pd.DataFrame): Dataframe containing the original data.
+
+    Returns:
+        tuple: Updated dataframe with additional features and the list of feature names.
+    """
+    features = [
+        "seconds_in_bucket",
+        "imbalance_buy_sell_flag",
+        "imbalance_size",
+        "matched_size",
+        "bid_size",
+        "ask_size",
+        "reference_price",
+        "far_price",
+        "near_price",
+        "ask_price",
+        "bid_price",
+        "wap",
+        "imb_s1",
+        "imb_s2",
+    ]
+
+    df = df.copy()
+
+    df["imb_s1"] = (df["bid_size"] - df["ask_size"]) / (df["bid_size"] + df["ask_size"])
+    df["imb_s2"] = (df["imbalance_size"] - df["matched_size"]) / (
+        df["matched_size"] + df["imbalance_size"]
+    )
+
+    prices = [
+        "reference_price",
+        "far_price",
+        "near_price",
+        "ask_price",
+        "bid_price",
+        "wap",
+    ]
+    for i, a in enumerate(prices):
+        for j, b in enumerate(prices[i + 1 :], i + 1):
+            df[f"{a}_{b}_diff"] = df[a] - df[b]
+            features.append(f"{a}_{b}_diff")
+    return df, features
+
+
+def legacy_matrix(df):
+    """
+    Build the feature matrix the way training and inference used to.
+    """
+    df, feature_names = legacy_generate_features(df)
+    return df[feature_names].values, feature_names
+
+
+def generate_rows(num_rows, num_stocks=200, seed=0):
+    """
+    Generate synthetic order book snapshots shaped like the Optiver training data.
+
+    Args:
+        num_rows (int): Number of rows to generate.
+        num_stocks (int): Number of stocks per date.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: The synthetic stock data.
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(num_rows)
+    reference_price = 1 + rng.normal(0, 0.002, num_rows)
+    spread = np.abs(rng.normal(0, 0.0005, num_rows))
+    far_price = reference_price + rng.normal(0, 0.003, num_rows)
+    near_price = reference_price + rng.normal(0, 0.001, num_rows)
+    # Far and near prices are only published late in the auction
+    far_price[rng.random(num_rows) < 0.5] = np.nan
+    near_price[rng.random(num_rows) < 0.5] = np.nan
+
+    return pd.DataFrame(
+        {
+            "stock_id": (index % num_stocks).astype(np.int32),
+            "date_id": (index // (num_stocks * 55)).astype(np.int32),
+            "seconds_in_bucket": ((index // num_stocks) % 55 * 10).astype(np.int32),
+            "imbalance_size": rng.exponential(1e6, num_rows),
+            "imbalance_buy_sell_flag": rng.integers(-1, 2, num_rows).astype(np.int32),
+            "reference_price": reference_price,
+            "matched_size": rng.exponential(1e7, num_rows),
+            "far_price": far_price,
+            "near_price": near_price,
+            "bid_price": reference_price - spread,
+            "bid_size": rng.exponential(5e4, num_rows),
+            "ask_price": reference_price + spread,
+            "ask_size": rng.exponential(5e4, num_rows),
+            "wap": reference_price + rng.normal(0, 0.0002, num_rows),
+            "target": rng.normal(0, 6, num_rows),
+        }
+    )
+
+
+def run_case(name, func, df, repeat):
+    """
+    Time a feature function and measure the memory it allocates.
+
+    Returns:
+        tuple: The feature matrix and a result row.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matrix, _ = func(df)
+        timings.append(time.perf_counter() - start)
+        del matrix
+
+    tracemalloc.start()
+    matrix, _ = func(df)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    row = {
+        "implementation": name,
+        "rows": len(df),
+        "seconds": round(best, 4),
+        "rows_per_s": int(len(df) / best),
+        "peak_mb": round(peak_bytes / 1024**2, 1),
+        "dtype": str(matrix.dtype),
+    }
+    return matrix, row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1_000_000],
+        help="Row counts to benchmark.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per case, best is reported."
+    )
+    args = parser.parse_args()
+
+    results = []
+    for num_rows in args.rows:
+        df = generate_rows(num_rows)
+        legacy, legacy_row = run_case("generate_features", legacy_matrix, df, args.repeat)
+        engine, engine_row = run_case("compute_features", compute_features, df, args.repeat)
+
+        # The engine stores float32, so compare at the precision XGBoost trains on
+        match = np.array_equal(legacy.astype(np.float32), engine, equal_nan=True)
+        engine_row["speedup"] = round(legacy_row["seconds"] / engine_row["seconds"], 1)
+        legacy_row["speedup"] = 1.0
+        legacy_row["matches_legacy"] = engine_row["matches_legacy"] = match
+        results.extend([legacy_row, engine_row])
+
+        # Cost of appending the per-stock lag and rolling features
+        _, temporal_row = run_case(
+            "compute_features(temporal)",
+            lambda df: compute_features(df, temporal=True),
+            df,
+            args.repeat,
+        )
+        temporal_row["speedup"] = round(
+            legacy_row["seconds"] / temporal_row["seconds"], 1
+        )
+        temporal_row["matches_legacy"] = "n/a"
+        results.append(temporal_row)
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
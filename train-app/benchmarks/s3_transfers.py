@@ -0,0 +1,107 @@
+"""
+Benchmark of S3 transfers: a new client and local files per call against the
+shared client with tuned multipart settings and in-memory buffers.
+
+Uploads and downloads random payloads of the given sizes against moto's
+in-process S3 stand-in, the way the jobs did before and after the shared
+transfer service, and prints the mean wall time and throughput of each in one
+table. Requires moto, from requirements-dev.txt; no AWS account is used.
+
+Run from the train-app directory:
+
+    python -m benchmarks.s3_transfers --sizes 1 16 64 --repeat 5
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from moto import mock_aws
+
+from app.services.s3_handler import MiB, S3Handler, get_s3_client, get_transfer_config
+
+BUCKET = "benchmark"
+
+
+def new_client():
+    return boto3.client("s3", region_name=os.environ["REGION"])
+
+
+def file_round_trip(payload, key, tmp_dir):
+    """
+    Upload and download through local files with a new client per call.
+    """
+    local_path = os.path.join(tmp_dir, key)
+    with open(local_path, "wb") as f:
+        f.write(payload)
+    S3Handler(new_client(), TransferConfig(), BUCKET).upload_file(local_path, key)
+    S3Handler(new_client(), TransferConfig(), BUCKET).download_file(key, tmp_dir)
+    with open(local_path, "rb") as f:
+        return f.read()
+
+
+def memory_round_trip(payload, key, tmp_dir):
+    """
+    Upload and download through memory buffers with the shared client.
+    """
+    handler = S3Handler(get_s3_client(), get_transfer_config(), BUCKET)
+    handler.upload_fileobj(io.BytesIO(payload), key)
+    buffer = io.BytesIO()
+    handler.download_fileobj(key, buffer)
+    return buffer.getvalue()
+
+
+def measure(round_trip, payload, key, tmp_dir, repeat):
+    """
+    Return the mean wall time of a round trip, checking the data survives it.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = round_trip(payload, key, tmp_dir)
+        times.append(time.perf_counter() - start)
+        assert data == payload, f"{round_trip.__name__} corrupted {key}"
+    return sum(times) / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 16, 64],
+        help="Payload sizes in MiB.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Round trips per payload and method."
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with mock_aws(), tempfile.TemporaryDirectory() as tmp_dir:
+        new_client().create_bucket(Bucket=BUCKET)
+        print(f"{'size':>8} {'method':>8} {'seconds':>9} {'MiB/s':>8} {'speedup':>8}")
+        for size in args.sizes:
+            payload = os.urandom(size * MiB)
+            key = f"payload_{size}.bin"
+            file_seconds = measure(file_round_trip, payload, key, tmp_dir, args.repeat)
+            memory_seconds = measure(
+                memory_round_trip, payload, key, tmp_dir, args.repeat
+            )
+            for method, seconds in (("file", file_seconds), ("memory", memory_seconds)):
+                print(
+                    f"{size:>5}MiB {method:>8} {seconds:>9.3f} "
+                    f"{2 * size / seconds:>8.1f} {file_seconds / seconds:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
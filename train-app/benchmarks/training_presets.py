@@ -0,0 +1,94 @@
+"""
+Benchmark of the training presets: retrain wall time against cross-validated MAE.
+
+Fine-tunes a small base model on synthetic order book snapshots with every preset
+in ``TRAINING_PRESETS`` through the same cross-validation as ``/train-model/``
+and prints the wall time, boosting rounds and mean fold MAE of each in one table.
+
+Run from the train-app directory:
+
+    python -m benchmarks.training_presets --rows 500000 --nthread 32
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from app.models import TRAINING_PRESETS
+from app.services.data_operations import cross_validate
+from app.services.external_memory import load_batch
+from benchmarks.feature_engine import generate_rows
+
+BASE_ROUNDS = 20
+
+
+def make_target(df, seed=0):
+    """
+    Give the synthetic rows a target the features can partly explain.
+    """
+    rng = np.random.default_rng(seed)
+    imbalance = (df["bid_size"] - df["ask_size"]) / (df["bid_size"] + df["ask_size"])
+    signal = 1e4 * (df["wap"] - df["reference_price"]) + 3 * imbalance
+    return signal + rng.normal(0, 1, len(df))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rows", type=int, default=500_000, help="Number of training rows."
+    )
+    parser.add_argument(
+        "--nthread", type=int, default=None, help="Threads per job, all cores if not set."
+    )
+    parser.add_argument(
+        "--presets",
+        nargs="+",
+        default=list(TRAINING_PRESETS),
+        choices=list(TRAINING_PRESETS),
+        help="Presets to benchmark.",
+    )
+    args = parser.parse_args()
+
+    df = generate_rows(args.rows)
+    df["target"] = make_target(df)
+    X, y = load_batch(df)
+
+    # The base model is trained on the first tenth, as a previous day's model
+    base_rows = len(y) // 10
+    base_model = xgb.train(
+        {"objective": "reg:squarederror", "tree_method": "hist"},
+        xgb.DMatrix(X[:base_rows], label=y[:base_rows]),
+        num_boost_round=BASE_ROUNDS,
+    ).save_raw()
+
+    results = []
+    for name in args.presets:
+        profile = TRAINING_PRESETS[name].model_copy(update={"nthread": args.nthread})
+        start = time.perf_counter()
+        folds = cross_validate(X[base_rows:], y[base_rows:], base_model, profile)
+        seconds = time.perf_counter() - start
+        # Best iterations count the base model's rounds too
+        best_iterations = [model.best_iteration + 1 for model, _ in folds]
+        added_rounds = int(np.mean(best_iterations)) - BASE_ROUNDS
+        results.append(
+            {
+                "preset": name,
+                "rows": len(y) - base_rows,
+                "folds": profile.n_splits,
+                "max_bin": profile.max_bin,
+                "rounds_added": added_rounds,
+                "seconds": round(seconds, 2),
+                "mean_mae": round(
+                    float(np.mean([model.best_score for model, _ in folds])), 5
+                ),
+            }
+        )
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import io
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from app.services.artifact_cache import ArtifactCache
+from app.services.s3_handler import S3Handler
+
+BUCKET = "bucket"
+KEY = "trained_models/model.ubj"
+
+
+@pytest.fixture
+def s3():
+    client = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+    with Stubber(client) as stubber:
+        yield S3Handler(s3_client=client, bucket_name=BUCKET), stubber
+        stubber.assert_no_pending_responses()
+
+
+def stub_head(stubber, etag):
+    stubber.add_response(
+        "head_object", {"ETag": f'"{etag}"'}, {"Bucket": BUCKET, "Key": KEY}
+    )
+
+
+def stub_get(stubber, etag, data):
+    stubber.add_response(
+        "get_object",
+        {"ETag": f'"{etag}"', "Body": StreamingBody(io.BytesIO(data), len(data))},
+        {"Bucket": BUCKET, "Key": KEY, "IfMatch": etag},
+    )
+
+
+def test_miss_downloads_the_version_then_hits_locally(s3, tmp_path):
+    handler, stubber = s3
+    cache = ArtifactCache(tmp_path, max_bytes=1024**2)
+
+    stub_head(stubber, "e1")
+    stub_get(stubber, "e1", b"model")
+    assert cache.get_bytes(handler, KEY) == (b"model", "e1")
+
+    # A hit only looks up the ETag
+    stub_head(stubber, "e1")
+    assert cache.get_bytes(handler, KEY) == (b"model", "e1")
+    assert [path.suffix for path in tmp_path.iterdir()] == [".ubj"]
+
+
+def test_changed_object_gets_a_new_file(s3, tmp_path):
+    handler, stubber = s3
+    cache = ArtifactCache(tmp_path, max_bytes=1024**2)
+
+    stub_head(stubber, "e1")
+    stub_get(stubber, "e1", b"old")
+    cache.get_bytes(handler, KEY)
+    stub_head(stubber, "e2")
+    stub_get(stubber, "e2", b"new")
+    assert cache.get_bytes(handler, KEY) == (b"new", "e2")
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_object_changed_during_download_is_not_cached(s3, tmp_path):
+    handler, stubber = s3
+    cache = ArtifactCache(tmp_path, max_bytes=1024**2)
+
+    stub_head(stubber, "e1")
+    stubber.add_client_error(
+        "get_object", service_error_code="PreconditionFailed", http_status_code=412
+    )
+    with pytest.raises(ClientError):
+        cache.get_bytes(handler, KEY)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_least_recently_used_files_are_evicted(s3, tmp_path):
+    handler, stubber = s3
+    cache = ArtifactCache(tmp_path, max_bytes=10)
+
+    for etag in ("e1", "e2"):
+        stub_head(stubber, etag)
+        stub_get(stubber, etag, b"x" * 6)
+        cache.get_bytes(handler, KEY)
+    assert [path.name for path in tmp_path.iterdir()] == [
+        cache.path(BUCKET, KEY, "e2").name
+    ]
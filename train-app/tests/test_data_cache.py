@@ -0,0 +1,52 @@
+import pandas as pd
+
+from app.services.data_cache import DayCache
+
+DAY = pd.DataFrame({"date_id": [5, 5], "target": [1.0, 2.0]})
+
+
+class CountingValidator:
+    def __init__(self, current=True):
+        self.current = current
+        self.calls = 0
+
+    def __call__(self, date_id, df):
+        self.calls += 1
+        return self.current
+
+
+def test_hits_are_validated_once_per_interval(tmp_path):
+    validate = CountingValidator()
+    DayCache(tmp_path, max_bytes=1024**2).put(5, DAY)
+    cache = DayCache(tmp_path, 1024**2, validate, revalidate_seconds=3600)
+
+    for _ in range(3):
+        pd.testing.assert_frame_equal(cache.get(5), DAY)
+    assert validate.calls == 1
+
+
+def test_days_written_by_the_cache_skip_validation(tmp_path):
+    validate = CountingValidator()
+    cache = DayCache(tmp_path, 1024**2, validate, revalidate_seconds=3600)
+
+    cache.put(5, DAY)
+    assert cache.get(5) is not None
+    assert validate.calls == 0
+
+
+def test_without_an_interval_every_hit_is_validated(tmp_path):
+    validate = CountingValidator()
+    cache = DayCache(tmp_path, 1024**2, validate)
+
+    cache.put(5, DAY)
+    cache.get(5)
+    cache.get(5)
+    assert validate.calls == 2
+
+
+def test_stale_days_are_dropped(tmp_path):
+    DayCache(tmp_path, max_bytes=1024**2).put(5, DAY)
+    cache = DayCache(tmp_path, 1024**2, CountingValidator(current=False), 3600)
+
+    assert cache.get(5) is None
+    assert not cache.path(5).exists()
@@ -0,0 +1,21 @@
+import numpy as np
+
+from app.services.features import FEATURE_NAMES, compute_features
+from benchmarks.feature_engine import generate_rows, legacy_matrix
+
+
+def test_compute_features_matches_legacy_generate_features():
+    df = generate_rows(2_000, num_stocks=20, seed=1)
+    rng = np.random.default_rng(2)
+    for column in ["imbalance_size", "matched_size", "bid_size", "wap"]:
+        df.loc[rng.random(len(df)) < 0.1, column] = np.nan
+    # Zero sizes make both imbalance ratios 0 / 0
+    df.loc[:9, ["bid_size", "ask_size", "imbalance_size", "matched_size"]] = 0.0
+
+    expected, expected_names = legacy_matrix(df)
+    X, names = compute_features(df)
+
+    assert names == expected_names == FEATURE_NAMES
+    assert X.dtype == np.float32
+    assert np.isnan(X).any()
+    assert np.allclose(X, expected, rtol=1e-6, equal_nan=True)
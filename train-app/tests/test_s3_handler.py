@@ -0,0 +1,42 @@
+import io
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from app.services.s3_handler import S3Handler
+
+BUCKET = "bucket"
+KEY = "trained_models/model.ubj"
+
+
+@pytest.fixture
+def s3():
+    client = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+    # Upload in the calling thread, where the stubber sees the requests in order
+    config = TransferConfig(use_threads=False)
+    with Stubber(client) as stubber:
+        yield S3Handler(client, config, BUCKET), stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_upload_fileobj_uploads(s3):
+    handler, stubber = s3
+    stubber.add_response("put_object", {"ETag": '"e1"'})
+    handler.upload_fileobj(io.BytesIO(b"model"), KEY)
+
+
+def test_upload_fileobj_raises_when_the_upload_fails(s3):
+    handler, stubber = s3
+    stubber.add_client_error(
+        "put_object", service_error_code="AccessDenied", http_status_code=403
+    )
+    with pytest.raises(ClientError):
+        handler.upload_fileobj(io.BytesIO(b"model"), KEY)
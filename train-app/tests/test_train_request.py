@@ -0,0 +1,55 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models import TrainRequest
+from app.services.data_operations import get_train_date_ids
+
+
+def train_request(**dates):
+    return TrainRequest(model_id=1, model_name="model", **dates)
+
+
+def test_range_skips_seen_days():
+    request = train_request(start_date_id=8, end_date_id=12, validation_days=2)
+    assert get_train_date_ids(request, seen_through=9) == ([10, 11, 12], [8, 9])
+
+
+def test_end_only_starts_after_seen_days():
+    request = train_request(end_date_id=12)
+    assert get_train_date_ids(request, seen_through=9) == ([10, 11, 12], [])
+
+
+def test_single_date_id():
+    request = train_request(date_id=10)
+    assert get_train_date_ids(request, seen_through=9) == ([10], [])
+
+
+def test_already_seen_days_are_rejected():
+    request = train_request(date_id=9)
+    with pytest.raises(ValueError, match="already trained"):
+        get_train_date_ids(request, seen_through=9)
+
+
+@pytest.mark.parametrize(
+    "dates",
+    [
+        {},
+        {"start_date_id": 10},
+        {"start_date_id": 10, "date_id": 10},
+        {"start_date_id": 12, "end_date_id": 10},
+    ],
+)
+def test_requests_without_a_usable_range_are_rejected(dates):
+    with pytest.raises(ValidationError):
+        train_request(**dates)
+
+
+def test_external_memory_requires_hist():
+    with pytest.raises(ValidationError, match="hist"):
+        train_request(
+            date_id=10,
+            training_mode="external_memory",
+            profile={"tree_method": "approx"},
+        )
+    request = train_request(date_id=10, training_mode="external_memory", profile="fast")
+    assert request.profile.tree_method == "hist"